@@ -0,0 +1,109 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+"""
+Micro-benchmark of per-call tool dispatch overhead.
+
+Compares the original dispatch (linear scan of AVAILABLE_TOOLS,
+inspect.signature on every call, model_cls(**arguments)) with the compiled
+TOOL_REGISTRY. Handlers are replaced by no-op coroutines of the same arity,
+so only lookup, validation and the call itself are measured.
+
+Usage (from the repository root, with the package installed or on the path):
+    PYTHONPATH=. python benchmarks/dispatch.py [iterations] > bench_output.txt
+"""
+
+import asyncio
+import inspect
+import sys
+import time
+
+import juspay_mcp.tools as core_tools
+import juspay_dashboard_mcp.tools as dashboard_tools
+from juspay_mcp.dispatch import compile_tools
+
+# Tool name and a valid argument set for each package. update_order_juspay
+# sits at the end of the core AVAILABLE_TOOLS (only batch_call follows it),
+# which is close to the worst case for the linear scan.
+CASES = [
+    (core_tools, "order_status_api_juspay", {"order_id": "order_123"}),
+    (core_tools, "update_order_juspay", {"order_id": "order_123", "amount": "90.00"}),
+    (dashboard_tools, "juspay_get_order_details", {"order_id": "order_123"}),
+    (
+        dashboard_tools,
+        "q_api",
+        {
+            "metric": "success_rate",
+            "interval": {"start": "2025-01-01T00:00:00Z", "end": "2025-01-01T23:59:59Z"},
+            "dimensions": ["payment_gateway"],
+        },
+    ),
+]
+
+
+def _noop(arity):
+    if arity == 2:
+        async def handler(payload, meta_info=None):
+            return None
+    elif arity == 1:
+        async def handler(payload):
+            return None
+    else:
+        async def handler():
+            return None
+    return handler
+
+
+def _stub_tools(tools):
+    return [
+        {**tool, "handler": _noop(len(inspect.signature(tool["handler"]).parameters))}
+        for tool in tools
+    ]
+
+
+async def legacy_dispatch(tools, name, arguments):
+    tool_entry = next((t for t in tools if t["name"] == name), None)
+    required = tool_entry["schema"].get("required", [])
+    missing = [key for key in required if key not in arguments]
+    if missing:
+        raise ValueError(f"Missing required fields for {name}: {missing}")
+    handler = tool_entry["handler"]
+    model_cls = tool_entry.get("model")
+    if model_cls:
+        model_cls(**arguments).model_dump(exclude_none=True)
+    meta_info = arguments.pop("juspay_meta_info", None)
+    param_count = len(inspect.signature(handler).parameters)
+    if param_count == 1:
+        return await handler(arguments)
+    return await handler(arguments, meta_info)
+
+
+async def compiled_dispatch(registry, name, arguments):
+    tool = registry.get(name)
+    meta_info = arguments.pop("juspay_meta_info", None)
+    return await tool.invoke(tool.validate(arguments), meta_info)
+
+
+async def measure(dispatch, table, name, arguments, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await dispatch(table, name, dict(arguments))
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def main(iterations):
+    print(f"Dispatch overhead per call in microseconds ({iterations} iterations)")
+    print(f"{'tool':<40} {'before':>10} {'after':>10} {'speedup':>8}")
+    for module, name, arguments in CASES:
+        tools = _stub_tools(module.AVAILABLE_TOOLS)
+        registry = compile_tools(tools)
+        before = await measure(legacy_dispatch, tools, name, arguments, iterations)
+        after = await measure(compiled_dispatch, registry, name, arguments, iterations)
+        print(f"{name:<40} {before:>10.2f} {after:>10.2f} {before / after:>7.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
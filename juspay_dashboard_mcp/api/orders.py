@@ -91,10 +91,11 @@ async def list_orders_v4_juspay(payload: dict, meta_info: dict = None) -> dict:
     if payload.get("orderType"):
         request_data["qFilters"]["and"]["order_type"] = payload["orderType"]
 
-    host = await get_juspay_host_from_api()
+    host = await get_juspay_host_from_api(meta_info=meta_info)
     api_url = f"{host}/ec/v4/orders"
 
-    response = await post(api_url, request_data, None, meta_info)
+    # Parsed, not passed through: hyperlinks are added to the rows below.
+    response = await post(api_url, request_data, None, meta_info, parse=True)
     
     excluded_hosts = [
         "https://euler-x.internal.svc.k8s.mum.juspay.net/",
@@ -127,6 +128,6 @@ async def get_order_details_juspay(payload: dict, meta_info: dict) -> dict:
     if not order_id:
         raise ValueError("'order_id' is required in the payload")
 
-    host = await get_juspay_host_from_api()
+    host = await get_juspay_host_from_api(meta_info=meta_info)
     api_url = f"{host}/api/ec/v1/orders/{order_id}"
     return await post(api_url, {}, None, meta_info)
@@ -22,7 +22,7 @@ async def list_payment_links_v1_juspay(payload: dict, meta_info: dict = None) ->
     Raises:
         Exception: If the API call fails.
     """
-    host = await get_juspay_host_from_api()
+    host = await get_juspay_host_from_api(meta_info=meta_info)
     api_url = f"{host}/api/ec/v1/paymentLinks/list"
 
     # Build request_data directly from payload, only including expected keys
@@ -4,28 +4,92 @@
 # you may not use this file except in compliance with the License.
 # You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
 
-import asyncio
 import json
-from pydantic import Field
-import requests
+import httpx
+import asyncio
+import contextlib
+from typing import AsyncIterator
 import logging
-import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+from juspay_dashboard_mcp.api.utils import get_client, track_request
+from juspay_mcp.cache import AsyncTTLCache, hash_key
+from juspay_dashboard_mcp.config import (
+    get_common_headers,
+    JUSPAY_BASE_URL,
+    JUSPAY_WEB_LOGIN_TOKEN,
+    JUSPAY_HTTP_TIMEOUT,
+    JUSPAY_QAPI_CONNECT_TIMEOUT,
+    JUSPAY_QAPI_READ_TIMEOUT,
+    JUSPAY_QAPI_CACHE_TTL,
+    JUSPAY_QAPI_CACHE_OPEN_TTL,
+    JUSPAY_QAPI_CACHE_MAX_BYTES,
+    JUSPAY_QAPI_SHARD_CONCURRENCY,
+    JUSPAY_QAPI_BATCH_CONCURRENCY,
+)
 
 from juspay_dashboard_mcp.api_schema.qapi import (
     DimensionList,
+    DimensionObject,
     Filter,
     Interval,
     Metric,
     SortedOn,
     QApiResponse,
-    QApiSuccessResponse,
+    QApiSuccessRow,
     QApiErrorResponse,
     QApiPayload,
+    MetricEnum,
 )
 
 logger = logging.getLogger(__name__)
 
+QAPI_URL = f"{JUSPAY_BASE_URL}/api/q/query"
+QAPI_TIMEOUT = httpx.Timeout(
+    JUSPAY_HTTP_TIMEOUT,
+    connect=JUSPAY_QAPI_CONNECT_TIMEOUT,
+    read=JUSPAY_QAPI_READ_TIMEOUT,
+)
+
+# Metrics that can be summed across interval shards.
+ADDITIVE_METRICS = {
+    "total_amount",
+    "success_volume",
+    "order_with_transactions",
+    "order_with_transactions_gmv",
+}
+
+# Ratio metrics and the additive metric that is their denominator. Across
+# shards the numerator is recovered as ratio * denominator, summed, and
+# divided by the summed denominator. average_latency is left out: the query
+# API does not return the transaction count it is averaged over, so queries
+# for it are not sharded.
+RATIO_METRIC_DENOMINATORS = {
+    "success_rate": "order_with_transactions",
+    "conflict_txn_rate": "order_with_transactions",
+    "avg_ticket_size": "success_volume",
+}
+
+SHARD_LENGTHS = {
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+# Bucket lengths of DimensionObject granularities that the incremental trend
+# path can align to a day boundary.
+TREND_BUCKET_UNITS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+# Formats in which the query API labels time buckets.
+TREND_LABEL_FORMATS = ("%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d")
+
+# Rows parsed ahead of the consumer when streaming a query response.
+QAPI_STREAM_BUFFER_ROWS = 256
+_END_OF_ROWS = object()
+
 
 class DateTimeEncoder(json.JSONEncoder):
     """
@@ -119,76 +183,207 @@ def convert_utc_to_ist_in_qapi_response(
         return response_json
 
 
-def call_query_api(payload: QApiPayload) -> dict:
+def serialize_query_payload(payload: QApiPayload) -> dict:
     """
-    Utility function to call the query API with the provided payload.
+    Builds the request body for the query API from a QApiPayload.
+
+    The interval is converted from IST to UTC; filters, dimensions and
+    sortedOn are dumped using their JSON aliases.
+    """
+    # Create a serialized copy of the payload for the API
+    serialized_payload = {}
+
+    # Add domain and metric
+    serialized_payload["domain"] = payload.domain
+    serialized_payload["metric"] = payload.metric
+
+    # Process interval - ensure we convert datetimes to strings
+    logging.info(
+        f"QAPI Input: Original interval (IST expected): Start={payload.interval.start}, End={payload.interval.end}"
+    )
+    interval_dict = {}
+    interval_dict["start"] = ist_to_utc(payload.interval.start)
+    interval_dict["end"] = ist_to_utc(payload.interval.end)
+    logging.info(
+        f"QAPI Call: Converted interval (UTC): Start={interval_dict['start']}, End={interval_dict['end']}"
+    )
+    serialized_payload["interval"] = interval_dict
+
+    # Process filters if present
+    if payload.filters:
+        serialized_payload["filters"] = payload.filters.model_dump(
+            mode="json", by_alias=True
+        )
+
+    # Process dimensions
+    serialized_payload["dimensions"] = (
+        payload.dimensions.model_dump(mode="json", by_alias=True)
+        if payload.dimensions
+        else []
+    )
+
+    # Process sortedOn if present
+    if payload.sortedOn:
+        serialized_payload["sortedOn"] = payload.sortedOn.model_dump(
+            mode="json", by_alias=True
+        )
+    return serialized_payload
+
+
+async def stream_query_api(
+    serialized_payload: dict, meta_info: dict = None, max_rows: int = None
+) -> AsyncIterator[dict]:
+    """
+    Streams rows from the query API as they arrive.
+
+    The JSONL body is read line by line and every line is parsed and
+    validated as a QApiSuccessRow on its own, so the raw body is never held
+    as a whole. A background reader feeds the rows through a queue bounded
+    to QAPI_STREAM_BUFFER_ROWS; what the consumer keeps of the rows is up to
+    the consumer.
 
     Args:
-        payload: The payload to send to the query API (QApiPayload model)
+        serialized_payload: Request body built by serialize_query_payload.
+        meta_info: Optional per-request metadata; its 'x-web-logintoken' overrides
+            JUSPAY_WEB_LOGIN_TOKEN.
+        max_rows: Optional cap; the upstream response is abandoned once this
+            many rows have been yielded.
 
-    Returns:
-        The parsed response from the API as QApiResponse (either QApiSuccessResponse or QApiErrorResponse)
+    Yields:
+        dict: One validated result row.
+
+    Raises:
+        Exception: If the API call fails or a row does not validate.
+    """
+    headers = get_common_headers({}, meta_info)
+    client = get_client(QAPI_URL)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QAPI_STREAM_BUFFER_ROWS)
+
+    async def read_rows():
+        try:
+            with track_request(QAPI_URL):
+                async with client.stream(
+                    "POST",
+                    QAPI_URL,
+                    content=json_dumps_with_datetime(serialized_payload),
+                    headers=headers,
+                    timeout=QAPI_TIMEOUT,
+                ) as response:
+                    response.raise_for_status()  # Raise exception for HTTP errors
+                    async for line in response.aiter_lines():
+                        if line.strip():
+                            row = QApiSuccessRow.model_validate_json(line)
+                            await queue.put(row.model_dump())
+            await queue.put(_END_OF_ROWS)
+        except Exception as e:
+            await queue.put(e)
+
+    reader = asyncio.create_task(read_rows())
+    row_count = 0
+    try:
+        while max_rows is None or row_count < max_rows:
+            item = await queue.get()
+            if item is _END_OF_ROWS:
+                break
+            if isinstance(item, Exception):
+                raise item
+            row_count += 1
+            yield item
+        else:
+            logging.info(f"QAPI Stream: Stopped after max_rows={max_rows}")
+    finally:
+        reader.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await reader
+
+
+# Query results keyed by login token and normalized payload, bounded by the
+# approximate JSON size of the cached rows. Rows are measured one at a time
+# so that sizing a large result does not build its whole JSON text.
+_result_cache = AsyncTTLCache(
+    ttl=JUSPAY_QAPI_CACHE_TTL,
+    max_entries=4096,
+    max_bytes=JUSPAY_QAPI_CACHE_MAX_BYTES,
+    sizeof=lambda rows: sum(len(json_dumps_with_datetime(row)) for row in rows),
+)
+
+
+def result_cache_key(serialized_payload: dict, meta_info: dict = None, max_rows: int = None) -> str:
+    """
+    Returns the result cache key for a serialized query.
+
+    The key covers the login token (hashed), metric, dimensions, filters,
+    sortedOn, interval and row cap. Key order and the order of a metric list
+    do not affect the key.
+    """
+    normalized = dict(serialized_payload)
+    if isinstance(normalized.get("metric"), list):
+        normalized["metric"] = sorted(set(normalized["metric"]))
+    token = (meta_info or {}).get("x-web-logintoken") or JUSPAY_WEB_LOGIN_TOKEN or ""
+    return hash_key(
+        json.dumps([token, normalized, max_rows], sort_keys=True, cls=DateTimeEncoder)
+    )
+
+
+def result_cache_ttl(interval: Interval) -> float:
+    """
+    Returns how long the result of a query over interval may be cached.
+
+    Intervals that ended in the past get the long JUSPAY_QAPI_CACHE_TTL;
+    intervals that include the current time get JUSPAY_QAPI_CACHE_OPEN_TTL.
     """
     try:
-        # Create a serialized copy of the payload for the API
-        serialized_payload = {}
+        end = datetime.strptime(interval.end, "%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        return JUSPAY_QAPI_CACHE_OPEN_TTL
+    now_ist = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=5, minutes=30)
+    return JUSPAY_QAPI_CACHE_TTL if end < now_ist else JUSPAY_QAPI_CACHE_OPEN_TTL
 
-        # Add domain and metric
-        serialized_payload["domain"] = payload.domain
-        serialized_payload["metric"] = payload.metric
 
-        # Process interval - ensure we convert datetimes to strings
-        logging.info(
-            f"QAPI Input: Original interval (IST expected): Start={payload.interval.start}, End={payload.interval.end}"
-        )
-        interval_dict = {}
-        interval_dict["start"] = ist_to_utc(payload.interval.start)
-        interval_dict["end"] = ist_to_utc(payload.interval.end)
-        logging.info(
-            f"QAPI Call: Converted interval (UTC): Start={interval_dict['start']}, End={interval_dict['end']}"
-        )
-        serialized_payload["interval"] = interval_dict
+def result_cache_stats() -> dict:
+    """Returns entry count, size in bytes, hits, misses and evictions of the result cache."""
+    return _result_cache.stats()
 
-        # Process filters if present
-        if payload.filters:
-            serialized_payload["filters"] = payload.filters.model_dump(
-                mode="json", by_alias=True
-            )
 
-        # Process dimensions
-        serialized_payload["dimensions"] = (
-            payload.dimensions.model_dump(mode="json", by_alias=True)
-            if payload.dimensions
-            else []
-        )
+async def call_query_api(payload: QApiPayload, meta_info: dict = None, max_rows: int = None) -> dict:
+    """
+    Utility function to call the query API with the provided payload.
 
-        # Process sortedOn if present
-        if payload.sortedOn:
-            serialized_payload["sortedOn"] = payload.sortedOn.model_dump(
-                mode="json", by_alias=True
-            )
+    The rows are collected from stream_query_api into one list, which is
+    what the tool returns, so the full result is held in memory; use
+    max_rows to bound it. Results that fit JUSPAY_QAPI_CACHE_MAX_BYTES are
+    also kept in the result cache.
 
-        # Call the internal analytics API
-        logging.debug(f"QAPI Call: Sending payload: {serialized_payload}")
-        web_login_token = os.getenv("JUSPAY_WEB_LOGIN_TOKEN")
-        response = requests.post(
-            "https://portal.juspay.in/api/q/query",
-            data=json_dumps_with_datetime(serialized_payload),
-            headers={
-                "X-Web-LoginToken": web_login_token,
-                "Content-Type": "application/json",
-            },
-        )
-        logging.info(f"QAPI Response Raw (IST expected): {response.text}")
-        response.raise_for_status()  # Raise exception for HTTP errors
-
-        # Parse JSONL response
-        response_json = [json.loads(line) for line in response.text.splitlines()]
-        validated_response = QApiSuccessResponse.model_validate(response_json)
-        logging.info(
-            f"QAPI Return: Parsed response (IST expected): {validated_response}"
+    Args:
+        payload: The payload to send to the query API (QApiPayload model)
+        meta_info: Optional per-request metadata; its 'x-web-logintoken' overrides
+            JUSPAY_WEB_LOGIN_TOKEN.
+        max_rows: Optional cap on the number of rows returned.
+
+    Returns:
+        The list of result rows, or a QApiErrorResponse dict if the call failed.
+    """
+    try:
+        serialized_payload = serialize_query_payload(payload)
+
+        async def fetch_rows():
+            # Call the internal analytics API
+            logging.debug(f"QAPI Call: Sending payload: {serialized_payload}")
+            rows = [
+                row async for row in stream_query_api(serialized_payload, meta_info, max_rows)
+            ]
+            logging.info(f"QAPI Return: Parsed {len(rows)} rows (IST expected)")
+            logging.debug(f"QAPI Return: Parsed response (IST expected): {rows}")
+            return rows
+
+        rows = await _result_cache.get_or_load(
+            result_cache_key(serialized_payload, meta_info, max_rows),
+            fetch_rows,
+            ttl=result_cache_ttl(payload.interval),
         )
-        return validated_response.dict()
+        logging.debug(f"QAPI Cache: {_result_cache.stats()}")
+        # Hand out copies so callers cannot modify the cached rows.
+        return [dict(row) for row in rows]
     except Exception as e:
         logging.error(f"Error calling query API: {str(e)}")
         return QApiErrorResponse(
@@ -201,7 +396,302 @@ def call_query_api(payload: QApiPayload) -> dict:
         ).dict()
 
 
-async def q_api(payload: dict) -> QApiResponse:
+def split_interval(interval: Interval, shard_by: str) -> list[Interval]:
+    """
+    Splits interval into consecutive, non-overlapping day or week shards.
+
+    Each shard ends one second before the next one starts; the last shard
+    ends at the original interval end.
+    """
+    start = datetime.strptime(interval.start, "%Y-%m-%dT%H:%M:%SZ")
+    end = datetime.strptime(interval.end, "%Y-%m-%dT%H:%M:%SZ")
+    step = SHARD_LENGTHS[shard_by]
+    shards = []
+    while start <= end:
+        shard_end = min(start + step - timedelta(seconds=1), end)
+        shards.append(Interval.from_datetime(start, shard_end))
+        start += step
+    return shards
+
+
+def _has_limit_filter(filters) -> bool:
+    if isinstance(filters, dict):
+        return "limit" in filters or any(_has_limit_filter(v) for v in filters.values())
+    if isinstance(filters, list):
+        return any(_has_limit_filter(v) for v in filters)
+    return False
+
+
+def _sort_rows(rows: list[dict], sortedOn: SortedOn | None):
+    """Sorts merged rows in place the way the query API would have ordered them."""
+    if sortedOn:
+        sort_key = sortedOn.sortDimension
+        rows.sort(
+            key=lambda row: (row.get(sort_key) is None, row.get(sort_key) or 0),
+            reverse=sortedOn.ordering == "Desc",
+        )
+
+
+def can_shard(metrics: list[str]) -> bool:
+    """Returns whether every metric can be recombined across interval shards."""
+    return all(m in ADDITIVE_METRICS or m in RATIO_METRIC_DENOMINATORS for m in metrics)
+
+
+def merge_shard_rows(shard_rows: list[list[dict]], metrics: list[str]) -> list[dict]:
+    """
+    Merges the rows of several interval shards into one result.
+
+    Rows are grouped by their dimension values (every key that is not a
+    metric), so rows of time-granular dimensions from different shards are
+    simply concatenated. ADDITIVE_METRICS are summed; ratio metrics are
+    recomputed from their numerator and summed denominator. Groups keep the
+    order in which they first appear.
+
+    Raises:
+        ValueError: If a metric is neither additive nor a known ratio.
+    """
+    if not can_shard(metrics):
+        unsupported = [m for m in metrics if not can_shard([m])]
+        raise ValueError(f"Metrics cannot be merged across shards: {unsupported}")
+    metric_set = set(MetricEnum.__args__)
+    groups: dict[str, dict] = {}
+    for rows in shard_rows:
+        for row in rows:
+            dims = {k: v for k, v in row.items() if k not in metric_set}
+            key = json.dumps(dims, sort_keys=True, default=str)
+            group = groups.setdefault(key, {"row": dims, "sums": {}, "numerators": {}})
+            for metric in metrics:
+                value = row.get(metric)
+                if value is None:
+                    continue
+                if metric in RATIO_METRIC_DENOMINATORS:
+                    weight = row.get(RATIO_METRIC_DENOMINATORS[metric]) or 0
+                    group["numerators"][metric] = group["numerators"].get(metric, 0) + value * weight
+                else:
+                    group["sums"][metric] = group["sums"].get(metric, 0) + value
+
+    merged = []
+    for group in groups.values():
+        row = group["row"]
+        sums = group["sums"]
+        for metric in metrics:
+            if metric in RATIO_METRIC_DENOMINATORS:
+                denominator = sums.get(RATIO_METRIC_DENOMINATORS[metric])
+                numerator = group["numerators"].get(metric)
+                row[metric] = numerator / denominator if numerator is not None and denominator else None
+            else:
+                row[metric] = sums.get(metric)
+        merged.append(row)
+    return merged
+
+
+async def call_sharded_query_api(
+    payload: QApiPayload, shard_by: str, meta_info: dict = None, max_rows: int = None
+) -> dict:
+    """
+    Runs a query as concurrent day or week shards of its interval and merges the rows.
+
+    At most JUSPAY_QAPI_SHARD_CONCURRENCY shards are in flight at once. Each
+    shard goes through call_query_api, so shards that lie fully in the past
+    are served from the result cache on repeat queries. Queries whose filters
+    use a top-N 'limit' are not sharded, because a per-shard top N is not the
+    overall top N, and neither are queries for metrics that are not in
+    ADDITIVE_METRICS or RATIO_METRIC_DENOMINATORS (e.g. average_latency),
+    which cannot be recombined from shard values.
+
+    Returns:
+        The merged rows, or a QApiErrorResponse dict if any shard failed.
+    """
+    requested = payload.metric if isinstance(payload.metric, list) else [payload.metric]
+    shards = split_interval(payload.interval, shard_by)
+    filters = payload.filters.model_dump(mode="json", by_alias=True) if payload.filters else None
+    if len(shards) <= 1 or _has_limit_filter(filters):
+        return await call_query_api(payload, meta_info, max_rows)
+    if not can_shard(requested):
+        logging.info(f"QAPI Shards: Not sharding, metrics {requested} cannot be merged across shards")
+        return await call_query_api(payload, meta_info, max_rows)
+
+    # Every shard also fetches the denominators needed to recombine ratio metrics.
+    denominators = [RATIO_METRIC_DENOMINATORS[m] for m in requested if m in RATIO_METRIC_DENOMINATORS]
+    shard_metrics = list(dict.fromkeys(requested + denominators))
+    logging.info(f"QAPI Shards: Running {len(shards)} {shard_by} shards for metrics {shard_metrics}")
+
+    semaphore = asyncio.Semaphore(JUSPAY_QAPI_SHARD_CONCURRENCY)
+
+    async def run_shard(interval: Interval):
+        async with semaphore:
+            return await call_query_api(
+                payload.model_copy(update={"interval": interval, "metric": shard_metrics}),
+                meta_info,
+            )
+
+    results = await asyncio.gather(*(run_shard(shard) for shard in shards))
+    for result in results:
+        if isinstance(result, dict) and "error" in result:
+            return result
+
+    merged = merge_shard_rows(results, shard_metrics)
+    for row in merged:
+        for metric in shard_metrics:
+            if metric not in requested:
+                row.pop(metric, None)
+
+    _sort_rows(merged, payload.sortedOn)
+    return merged[:max_rows] if max_rows else merged
+
+
+# Rows of closed trend buckets, keyed by query shape and bucket start.
+_bucket_cache = AsyncTTLCache(
+    ttl=JUSPAY_QAPI_CACHE_TTL,
+    max_entries=65536,
+    max_bytes=JUSPAY_QAPI_CACHE_MAX_BYTES,
+    sizeof=lambda rows: len(json_dumps_with_datetime(rows)),
+)
+
+# Query shapes whose rows could not be mapped to trend buckets; they are
+# queried over the whole interval without the trend path.
+_unbucketed_shapes = AsyncTTLCache(ttl=JUSPAY_QAPI_CACHE_TTL, max_entries=4096)
+
+
+def trend_dimension(payload: QApiPayload) -> DimensionObject | None:
+    """
+    Returns the time dimension of a query that can be refreshed bucket by bucket.
+
+    That is a query with exactly one DimensionObject whose bucket length
+    divides a day, no top-N 'limit' filter, and an interval starting on a
+    bucket boundary. Other queries return None.
+    """
+    dimensions = payload.dimensions.root if payload.dimensions else []
+    time_dimensions = [d for d in dimensions if isinstance(d, DimensionObject)]
+    if len(time_dimensions) != 1:
+        return None
+    dimension = time_dimensions[0]
+    step = _bucket_length(dimension)
+    if step is None or timedelta(days=1) % step:
+        return None
+    filters = payload.filters.model_dump(mode="json", by_alias=True) if payload.filters else None
+    if _has_limit_filter(filters):
+        return None
+    try:
+        start = datetime.strptime(payload.interval.start, "%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        return None
+    return dimension if _bucket_start(start, step) == start else None
+
+
+def _bucket_length(dimension: DimensionObject) -> timedelta | None:
+    unit = TREND_BUCKET_UNITS.get(dimension.granularity.unit)
+    return unit * dimension.granularity.duration if unit else None
+
+
+def _bucket_start(moment: datetime, step: timedelta) -> datetime:
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return day + ((moment - day) // step) * step
+
+
+def _row_bucket(row: dict, interval_col: str, step: timedelta) -> datetime | None:
+    """Returns the bucket a row belongs to, read from its time label in IST."""
+    for key, value in row.items():
+        if not key.startswith(interval_col) or not isinstance(value, str):
+            continue
+        for fmt in TREND_LABEL_FORMATS:
+            try:
+                return _bucket_start(datetime.strptime(value, fmt), step)
+            except ValueError:
+                continue
+    return None
+
+
+async def call_trend_query_api(
+    payload: QApiPayload, dimension: DimensionObject, meta_info: dict = None, max_rows: int = None
+) -> dict:
+    """
+    Runs a time-granular query, fetching only the buckets that are not cached.
+
+    Closed buckets (those that ended before now and lie fully inside the
+    interval) are stored per query shape and bucket start. On a repeat query
+    only the still-open tail and any missing buckets are requested, as one
+    query per contiguous run, and the series is stitched back together in
+    bucket order. Rows are assigned to buckets by their time label, which is
+    expected in the dimension's time zone (IST). If a label cannot be read or
+    falls outside the run that returned it, the query shape is remembered
+    and later queries of that shape skip the trend path. When the failing
+    fetch already covered the whole interval its rows are returned as they
+    are; otherwise the whole interval is queried once more.
+
+    Returns:
+        The stitched rows, or a QApiErrorResponse dict if a run failed.
+    """
+    step = _bucket_length(dimension)
+    start = datetime.strptime(payload.interval.start, "%Y-%m-%dT%H:%M:%SZ")
+    end = datetime.strptime(payload.interval.end, "%Y-%m-%dT%H:%M:%SZ")
+    now_ist = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=5, minutes=30)
+
+    series = result_cache_key({**serialize_query_payload(payload), "interval": None}, meta_info)
+    if _unbucketed_shapes.get(series):
+        return await call_query_api(payload, meta_info, max_rows)
+    buckets = []
+    bucket = start
+    while bucket <= end:
+        buckets.append(bucket)
+        bucket += step
+
+    def is_closed(bucket: datetime) -> bool:
+        return bucket + step <= now_ist and bucket + step - timedelta(seconds=1) <= end
+
+    rows_by_bucket: dict[datetime, list[dict]] = {}
+    runs: list[list[datetime]] = []
+    for bucket in buckets:
+        cached = _bucket_cache.get(f"{series}:{bucket.isoformat()}") if is_closed(bucket) else None
+        if cached is not None:
+            rows_by_bucket[bucket] = cached
+        elif runs and runs[-1][-1] + step == bucket:
+            runs[-1].append(bucket)
+        else:
+            runs.append([bucket])
+    logging.info(
+        f"QAPI Trend: {len(buckets) - sum(len(run) for run in runs)} of {len(buckets)} buckets cached, "
+        f"fetching {len(runs)} runs"
+    )
+
+    semaphore = asyncio.Semaphore(JUSPAY_QAPI_SHARD_CONCURRENCY)
+
+    async def run_query(run: list[datetime]):
+        interval = Interval.from_datetime(run[0], min(run[-1] + step - timedelta(seconds=1), end))
+        async with semaphore:
+            return await call_query_api(payload.model_copy(update={"interval": interval}), meta_info)
+
+    results = await asyncio.gather(*(run_query(run) for run in runs))
+    fetched: dict[datetime, list[dict]] = {}
+    for run, result in zip(runs, results):
+        if isinstance(result, dict) and "error" in result:
+            return result
+        run_buckets = set(run)
+        for bucket in run:
+            fetched[bucket] = []
+        for row in result:
+            bucket = _row_bucket(row, dimension.intervalCol, step)
+            if bucket not in run_buckets:
+                _unbucketed_shapes.set(series, True)
+                if len(run) == len(buckets):
+                    logging.warning(f"QAPI Trend: Row outside its bucket run ({row}); not bucketing this query shape")
+                    return result[:max_rows] if max_rows else result
+                logging.warning(f"QAPI Trend: Row outside its bucket run ({row}); querying the full interval")
+                return await call_query_api(payload, meta_info, max_rows)
+            fetched[bucket].append(row)
+
+    for bucket, rows in fetched.items():
+        rows_by_bucket[bucket] = rows
+        if is_closed(bucket):
+            _bucket_cache.set(f"{series}:{bucket.isoformat()}", rows)
+
+    # Hand out copies so callers cannot modify the stored buckets.
+    stitched = [dict(row) for bucket in buckets for row in rows_by_bucket[bucket]]
+    _sort_rows(stitched, payload.sortedOn)
+    return stitched[:max_rows] if max_rows else stitched
+
+
+async def q_api(payload: dict, meta_info: dict = None) -> QApiResponse:
     """
     Tool for querying data from the analytics API.
 
@@ -213,13 +703,19 @@ async def q_api(payload: dict) -> QApiResponse:
         dimensions: Dimensions to include
         filters: Filters to apply
         sortedOn: Sorting criteria
+        max_rows: Optional cap on the number of rows returned
+        shard_by: Optional "day" or "week"; splits the interval into shards
+            that run concurrently and are merged
+
+    Trend queries with a minute, hour or day granularity that are not
+    sharded are refreshed incrementally; see call_trend_query_api.
 
     Returns:
         QApiResponse with the query results (Timestamps should be IST)
     """
     metric = payload.get("metric")
     interval = payload.get("interval")
-    dimensions = payload.get("dimensions")
+    dimensions = payload.get("dimensions") or []
     filters = payload.get("filters")
     sortedOn = payload.get("sortedOn")
 
@@ -239,4 +735,45 @@ async def q_api(payload: dict) -> QApiResponse:
     # Log the payload for debugging
     logging.debug(f"QAPI Tool: Creating payload: {json.dumps(q_api_payload.model_dump())}")
 
-    return await asyncio.to_thread(call_query_api, q_api_payload)
+    if payload.get("shard_by"):
+        return await call_sharded_query_api(
+            q_api_payload, payload["shard_by"], meta_info, payload.get("max_rows")
+        )
+    dimension = trend_dimension(q_api_payload)
+    if dimension is not None:
+        return await call_trend_query_api(q_api_payload, dimension, meta_info, payload.get("max_rows"))
+    return await call_query_api(q_api_payload, meta_info, payload.get("max_rows"))
+
+
+async def q_api_batch(payload: dict, meta_info: dict = None) -> list[dict]:
+    """
+    Tool for running several analytics queries concurrently.
+
+    Args:
+        payload: dict with 'queries', a list of q_api payloads (see q_api)
+        meta_info: Optional per-request metadata shared by every query
+
+    Every query goes through q_api, so the batch shares the result cache and
+    its in-flight loads; at most JUSPAY_QAPI_BATCH_CONCURRENCY queries run at
+    once.
+
+    Returns:
+        One {"query": index, "result": rows} or {"query": index, "error": message}
+        entry per query, in input order.
+    """
+    queries = payload.get("queries") or []
+    logging.info(f"QAPI Batch: Running {len(queries)} queries")
+    semaphore = asyncio.Semaphore(JUSPAY_QAPI_BATCH_CONCURRENCY)
+
+    async def run_query(index: int, query: dict) -> dict:
+        async with semaphore:
+            try:
+                result = await q_api(query, meta_info)
+            except Exception as e:
+                logging.error(f"QAPI Batch: Query {index} failed: {str(e)}")
+                return {"query": index, "error": str(e)}
+        if isinstance(result, dict) and "error" in result:
+            return {"query": index, "error": result["error"]}
+        return {"query": index, "result": result}
+
+    return await asyncio.gather(*(run_query(i, query) for i, query in enumerate(queries)))
@@ -7,85 +7,214 @@
 import os
 import httpx
 import logging
-from juspay_dashboard_mcp.config import get_common_headers, JUSPAY_BASE_URL
+import contextlib
+from dataclasses import dataclass, asdict
+from juspay_mcp.cache import AsyncTTLCache, hash_key
+from juspay_mcp.dispatch import RawJSON
+from juspay_dashboard_mcp.config import (
+    get_common_headers,
+    JUSPAY_BASE_URL,
+    JUSPAY_TOKEN_CACHE_TTL,
+    JUSPAY_TOKEN_CACHE_REFRESH_AHEAD,
+    JUSPAY_HTTP_TIMEOUT,
+    JUSPAY_HTTP_MAX_CONNECTIONS,
+    JUSPAY_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    JUSPAY_HTTP_KEEPALIVE_EXPIRY,
+)
 
 logger = logging.getLogger(__name__)
 
-async def call(api_url: str, additional_headers: dict = None, meta_info: dict = None) -> dict:
+
+@dataclass
+class PoolStats:
+    """Request counters for one upstream origin."""
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+
+# Pool registry: one pooled client per upstream origin (the portal base URL
+# and every distinct validHost), plus the counters used to size the pools.
+_clients: dict[str, httpx.AsyncClient] = {}
+_stats: dict[str, PoolStats] = {}
+
+# validHost per login token, keyed by a hash of the token.
+_host_cache = AsyncTTLCache(
+    ttl=JUSPAY_TOKEN_CACHE_TTL,
+    refresh_ahead=JUSPAY_TOKEN_CACHE_REFRESH_AHEAD,
+)
+
+def _origin(api_url: str) -> str:
+    url = httpx.URL(api_url)
+    return f"{url.scheme}://{url.netloc.decode('ascii')}"
+
+def get_client(api_url: str) -> httpx.AsyncClient:
+    """
+    Returns the shared AsyncClient for the upstream origin of api_url,
+    creating it on first use.
+    """
+    origin = _origin(api_url)
+    client = _clients.get(origin)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=JUSPAY_HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=JUSPAY_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=JUSPAY_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=JUSPAY_HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        _clients[origin] = client
+        logger.info(f"Opened pooled HTTP client for {origin}")
+    return client
+
+@contextlib.contextmanager
+def track_request(api_url: str):
+    """Counts a request against the pool statistics of its upstream origin."""
+    stats = _stats.setdefault(_origin(api_url), PoolStats())
+    stats.requests += 1
+    stats.in_flight += 1
+    stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+    try:
+        yield
+    except Exception:
+        stats.errors += 1
+        raise
+    finally:
+        stats.in_flight -= 1
+
+def pool_stats() -> dict:
+    """
+    Returns per-origin pool statistics.
+
+    Each entry holds the request counters kept by track_request and the
+    configured connection limit, so peak_in_flight can be compared against
+    max_connections when sizing the pools.
+    """
+    return {
+        origin: {**asdict(stats), "max_connections": JUSPAY_HTTP_MAX_CONNECTIONS}
+        for origin, stats in _stats.items()
+    }
+
+async def close_clients():
+    """Closes every pooled client and drops it from the registry."""
+    clients = list(_clients.items())
+    _clients.clear()
+    for origin, client in clients:
+        await client.aclose()
+        logger.info(f"Closed pooled HTTP client for {origin}")
+
+@contextlib.asynccontextmanager
+async def http_client_pool():
+    """
+    Keeps the pooled clients open for the lifetime of the server.
+
+    Warms up the client for JUSPAY_BASE_URL on entry; logs the pool
+    statistics and closes all clients on exit.
+    """
+    get_client(JUSPAY_BASE_URL)
+    try:
+        yield
+    finally:
+        logger.info(f"HTTP pool statistics: {pool_stats()}")
+        await close_clients()
+
+async def call(api_url: str, additional_headers: dict = None, meta_info: dict = None, parse: bool = False) -> dict | RawJSON:
     headers = get_common_headers({}, meta_info)
-    
+
     if additional_headers:
         headers.update(additional_headers)
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            logger.info(f"Calling Juspay API at: {api_url} with headers: {headers}")
+    client = get_client(api_url)
+    try:
+        logger.info(f"Calling Juspay API at: {api_url} with headers: {headers}")
+        with track_request(api_url):
             response = await client.get(api_url, headers=headers)
             response.raise_for_status()
-            response_data = response.json()
-            logger.info(f"API Response Data: {response_data}")
-            return response_data
-        except httpx.HTTPStatusError as e:
-            error_content = e.response.text if e.response else "Unknown error"
-            logger.error(f"HTTP error: {e.response.status_code if e.response else 'No response'} - {error_content}")
-            raise Exception(f"Juspay API HTTPError ({e.response.status_code if e.response else 'Unknown status'}): {error_content}") from e
-        except Exception as e:
-            logger.error(f"Error during Juspay API call: {e}")
-            raise Exception(f"Failed to call Juspay API: {e}") from e
-
-async def post(api_url: str, payload: dict,additional_headers: dict = None, meta_info: dict= None) -> dict:
-    headers = get_common_headers(payload, meta_info) 
+        logger.info(f"API Response Data: {response.text}")
+        return response.json() if parse else RawJSON(response.text)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code in (401, 403):
+            invalidate_token(headers.get("x-web-logintoken"))
+        error_content = e.response.text if e.response else "Unknown error"
+        logger.error(f"HTTP error: {e.response.status_code if e.response else 'No response'} - {error_content}")
+        raise Exception(f"Juspay API HTTPError ({e.response.status_code if e.response else 'Unknown status'}): {error_content}") from e
+    except Exception as e:
+        logger.error(f"Error during Juspay API call: {e}")
+        raise Exception(f"Failed to call Juspay API: {e}") from e
+
+async def post(api_url: str, payload: dict,additional_headers: dict = None, meta_info: dict= None, parse: bool = False) -> dict | RawJSON:
+    headers = get_common_headers(payload, meta_info)
 
     if additional_headers:
         headers.update(additional_headers)
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            logger.info(f"Calling Juspay API at: {api_url} with body: {payload} and headers: {headers}")
+    client = get_client(api_url)
+    try:
+        logger.info(f"Calling Juspay API at: {api_url} with body: {payload} and headers: {headers}")
+        with track_request(api_url):
             response = await client.post(api_url, headers=headers, json=payload)
             response.raise_for_status()
-            response_data = response.json()
-            logger.info(f"API Response Data: {response_data}")
-            return response_data
-        except httpx.HTTPStatusError as e:
-            error_content = e.response.text if e.response else "Unknown error"
-            logger.error(f"HTTP error: {e.response.status_code if e.response else 'No response'} - {error_content}")
-            raise Exception(f"Juspay API HTTPError ({e.response.status_code if e.response else 'Unknown status'}): {error_content}") from e
-        except Exception as e:
-            logger.error(f"Error during Juspay API call: {e}")
-            raise Exception(f"Failed to call Juspay API: {e}") from e
-        
+        logger.info(f"API Response Data: {response.text}")
+        return response.json() if parse else RawJSON(response.text)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code in (401, 403):
+            invalidate_token(headers.get("x-web-logintoken"))
+        error_content = e.response.text if e.response else "Unknown error"
+        logger.error(f"HTTP error: {e.response.status_code if e.response else 'No response'} - {error_content}")
+        raise Exception(f"Juspay API HTTPError ({e.response.status_code if e.response else 'Unknown status'}): {error_content}") from e
+    except Exception as e:
+        logger.error(f"Error during Juspay API call: {e}")
+        raise Exception(f"Failed to call Juspay API: {e}") from e
+
+
+def invalidate_token(token: str | None):
+    """Drops the cached validHost for token, e.g. after the upstream rejected it."""
+    if token:
+        _host_cache.invalidate(hash_key(token))
+
+async def _validate_token(token: str) -> str:
+    validate_url = f"{JUSPAY_BASE_URL}/api/ec/v1/validate/token"
+    client = get_client(validate_url)
+    with track_request(validate_url):
+        resp = await client.post(
+            validate_url,
+            headers={
+                "accept": "*/*",
+                "accept-language": "en-US,en;q=0.9",
+                "content-type": "application/json"
+            },
+            json={"token": token},
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+    data = resp.json()
+    valid_host = data.get("validHost")
+    if not valid_host:
+        raise Exception("validHost not found in Juspay token validation response.")
+    if not valid_host.startswith("http"):
+        valid_host = f"https://{valid_host}"
+    return valid_host
 
 async def get_juspay_host_from_api(token: str = None, headers: dict = None ,meta_info: dict = None) -> str:
     """
     Returns the Juspay host URL based on token validation.
     Calls the validate API and uses the 'validHost' field from the response.
-    """
-    validate_url = f"{JUSPAY_BASE_URL}/api/ec/v1/validate/token"
 
-    token_to_use = token or os.environ.get("JUSPAY_WEB_LOGIN_TOKEN") or meta_info.get("x-web-logintoken")
+    The token is taken from the explicit argument, then the per-request
+    'x-web-logintoken' in meta_info, then JUSPAY_WEB_LOGIN_TOKEN. Validated
+    hosts are cached per token for JUSPAY_TOKEN_CACHE_TTL seconds and
+    concurrent validations of the same token share one upstream call.
+    """
+    token_to_use = token or (meta_info or {}).get("x-web-logintoken") or os.environ.get("JUSPAY_WEB_LOGIN_TOKEN")
     if not token_to_use:
         raise Exception("Juspay token not provided.")
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(
-                validate_url,
-                headers={
-                    "accept": "*/*",
-                    "accept-language": "en-US,en;q=0.9",
-                    "content-type": "application/json"
-                },
-                json={"token": token_to_use}
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            valid_host = data.get("validHost")
-            if not valid_host:
-                raise Exception("validHost not found in Juspay token validation response.")
-            if not valid_host.startswith("http"):
-                valid_host = f"https://{valid_host}"
-            return valid_host
+        return await _host_cache.get_or_load(
+            hash_key(token_to_use), lambda: _validate_token(token_to_use)
+        )
     except Exception as e:
         logger.error(f"Token validation failed: {e}")
         raise
@@ -7,9 +7,10 @@
 from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field
 from juspay_dashboard_mcp.api_schema.headers import WithHeaders
+from juspay_dashboard_mcp.api_schema.output import WithOutputFormat
 from juspay_dashboard_mcp.api_schema.qapi import Filter
 
-class JuspayListOrdersV4Payload(WithHeaders):
+class JuspayListOrdersV4Payload(WithHeaders, WithOutputFormat):
     dateFrom: str = Field(
         ...,
         description="Start date/time in ISO 8601 format (e.g., 'YYYY-MM-DDTHH:MM:SSZ')."
@@ -0,0 +1,36 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+
+OutputFormat = Literal["json", "columnar", "csv"]
+
+class WithOutputFormat(BaseModel):
+    output_format: Optional[OutputFormat] = Field(
+        None,
+        description=(
+            "Optional output format for the result rows. 'json' (default) returns one object per row; "
+            "'columnar' returns the column names once plus one value array per column; "
+            "'csv' returns a header line followed by one line per row. Use 'columnar' or 'csv' for large results."
+        ),
+    )
+
+class JuspayGetResultPagePayload(WithOutputFormat):
+    handle: str = Field(
+        ...,
+        description="Result handle returned by juspay_list_orders_v4, juspay_list_users_v2 or q_api for an oversized result."
+    )
+    offset: Optional[int] = Field(
+        0,
+        ge=0,
+        description="Index of the first row to return; use 'next_offset' from the previous page (default: 0)."
+    )
+    limit: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Number of rows to return (default: the page size reported with the handle)."
+    )
@@ -7,6 +7,7 @@
 from typing import List, Literal, Union, Dict, Any, Optional
 from datetime import datetime
 from pydantic import BaseModel, RootModel, Field, ConfigDict, model_validator
+from juspay_dashboard_mcp.api_schema.output import WithOutputFormat
 
 #################################
 #            Metrics            #
@@ -494,7 +495,7 @@ class QApiPayload(BaseModel):
     dimensions: DimensionList = []
     sortedOn: Optional[SortedOn] = None
 
-class ToolQApiPayload(BaseModel):
+class ToolQApiPayload(WithOutputFormat):
     """Pydantic model for the Tool Interface Q API payload"""
 
     metric: Metric
@@ -502,6 +503,27 @@ class ToolQApiPayload(BaseModel):
     filters: Optional[Filter] = None
     dimensions: DimensionList = []
     sortedOn: Optional[SortedOn] = None
+    max_rows: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Optional cap on the number of rows returned. Use it for high-cardinality breakdowns (e.g. card_bin, error_message) when only the first rows are needed.",
+    )
+    shard_by: Optional[Literal["day", "week"]] = Field(
+        None,
+        description="Optional. For long intervals (e.g. 30-90 days), split the interval into day or week shards that are queried concurrently and merged. Additive metrics (total_amount, success_volume, order_with_transactions, order_with_transactions_gmv) are summed and success_rate, conflict_txn_rate and avg_ticket_size are recomputed. Not applied when filters use a top-N 'limit' or when average_latency is requested.",
+    )
+
+
+
+class ToolQApiBatchPayload(BaseModel):
+    """Pydantic model for a batch of Tool Interface Q API payloads"""
+
+    queries: List[ToolQApiPayload] = Field(
+        ...,
+        min_length=1,
+        max_length=20,
+        description="The Q API queries to run, each in the same format as a single q_api call. All queries are validated before any of them runs; results are returned in the same order.",
+    )
 
 
 
@@ -846,3 +868,11 @@ api_description = """
             }
         }
     """
+
+batch_api_description = """
+Runs several Q API (analytics) queries concurrently and returns one result per query, in order.
+Use this instead of repeated q_api calls when a question needs several related breakdowns
+(e.g. success rate by gateway, by payment method type and by bank for the same interval).
+Each entry of `queries` follows exactly the q_api input format and rules described in the q_api tool.
+Each result is {"query": <index>, "result": <rows>} or {"query": <index>, "error": <message>}; a failing query does not affect the others.
+"""
@@ -8,6 +8,7 @@ from typing import Optional
 from pydantic import BaseModel, Field
 
 from juspay_dashboard_mcp.api_schema.headers import WithHeaders
+from juspay_dashboard_mcp.api_schema.output import WithOutputFormat
 
 class JuspayGetUserPayload(WithHeaders):
     userId: str = Field(
@@ -21,7 +22,7 @@ class JuspayGetUserDetailsPayload(WithHeaders):
         description="Unique identifier for the user to retrieve detailed information for."
     )
 
-class JuspayListUsersV2Payload(WithHeaders):
+class JuspayListUsersV2Payload(WithHeaders, WithOutputFormat):
     offset: Optional[int] = Field(
         0, 
         description="Pagination offset for the user list (default: 0)."
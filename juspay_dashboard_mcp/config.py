@@ -17,12 +17,69 @@ JUSPAY_ENV = os.getenv("JUSPAY_ENV", "sandbox").lower()
 JUSPAY_WEB_LOGIN_TOKEN = os.getenv("JUSPAY_WEB_LOGIN_TOKEN")
 
 if JUSPAY_ENV == "production":
-    JUSPAY_BASE_URL = os.getenv("JUSPAY_PROD_BASE_URL", "https://portal.juspay.in")
+    _default_base_url, _base_url_variable = "https://portal.juspay.in", "JUSPAY_PROD_BASE_URL"
     logger.info("Using Juspay Production Environment")
 else:
-    JUSPAY_BASE_URL = os.getenv("JUSPAY_SANDBOX_BASE_URL", "https://sandbox.portal.juspay.in")
+    _default_base_url, _base_url_variable = "https://sandbox.portal.juspay.in", "JUSPAY_SANDBOX_BASE_URL"
     logger.info("Using Juspay Sandbox Environment")
 
+# Portal base URL. JUSPAY_DASHBOARD_BASE_URL always applies. The shared
+# JUSPAY_PROD_BASE_URL / JUSPAY_SANDBOX_BASE_URL names are only honoured by the
+# Dashboard server: when the Core server loads this package (get_order_360_juspay)
+# they point at the Core API host.
+if os.getenv("JUSPAY_MCP_TYPE") != "DASHBOARD":
+    _base_url_variable = None
+JUSPAY_BASE_URL = (
+    os.getenv("JUSPAY_DASHBOARD_BASE_URL")
+    or (_base_url_variable and os.getenv(_base_url_variable))
+    or _default_base_url
+)
+
+# Set to "true" to serve the HTTP pool and Q API result cache statistics as
+# JSON at /juspay-dashboard-stats (HTTP mode only).
+JUSPAY_STATS_ENDPOINT = os.getenv("JUSPAY_STATS_ENDPOINT", "false").lower() == "true"
+
+# Connection pool settings for the shared upstream HTTP clients.
+JUSPAY_HTTP_TIMEOUT = float(os.getenv("JUSPAY_HTTP_TIMEOUT", "30"))
+JUSPAY_HTTP_MAX_CONNECTIONS = int(os.getenv("JUSPAY_HTTP_MAX_CONNECTIONS", "100"))
+JUSPAY_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("JUSPAY_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+JUSPAY_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("JUSPAY_HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# Token validation cache: how long a validated host is reused, and how long
+# before expiry a background revalidation starts. A TTL of 0 disables caching.
+JUSPAY_TOKEN_CACHE_TTL = float(os.getenv("JUSPAY_TOKEN_CACHE_TTL", "300"))
+JUSPAY_TOKEN_CACHE_REFRESH_AHEAD = float(os.getenv("JUSPAY_TOKEN_CACHE_REFRESH_AHEAD", "60"))
+
+# Q API (analytics) timeouts. Long breakdowns can take a while to compute,
+# so the read timeout is more generous than the default request timeout.
+JUSPAY_QAPI_CONNECT_TIMEOUT = float(os.getenv("JUSPAY_QAPI_CONNECT_TIMEOUT", "5"))
+JUSPAY_QAPI_READ_TIMEOUT = float(os.getenv("JUSPAY_QAPI_READ_TIMEOUT", "60"))
+
+# Q API result cache. Queries whose interval ended in the past are cached for
+# JUSPAY_QAPI_CACHE_TTL seconds, queries whose interval includes "now" for
+# JUSPAY_QAPI_CACHE_OPEN_TTL seconds. A TTL of 0 disables that tier.
+JUSPAY_QAPI_CACHE_TTL = float(os.getenv("JUSPAY_QAPI_CACHE_TTL", "3600"))
+JUSPAY_QAPI_CACHE_OPEN_TTL = float(os.getenv("JUSPAY_QAPI_CACHE_OPEN_TTL", "60"))
+JUSPAY_QAPI_CACHE_MAX_BYTES = int(os.getenv("JUSPAY_QAPI_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Maximum number of interval shards of one sharded q_api query in flight at once.
+JUSPAY_QAPI_SHARD_CONCURRENCY = int(os.getenv("JUSPAY_QAPI_SHARD_CONCURRENCY", "4"))
+
+# Maximum number of queries of one q_api_batch call in flight at once.
+JUSPAY_QAPI_BATCH_CONCURRENCY = int(os.getenv("JUSPAY_QAPI_BATCH_CONCURRENCY", "4"))
+
+# batch_call: calls of one batch in flight at once, and the default timeout
+# in seconds for each call.
+JUSPAY_BATCH_CONCURRENCY = int(os.getenv("JUSPAY_BATCH_CONCURRENCY", "8"))
+JUSPAY_BATCH_ITEM_TIMEOUT = float(os.getenv("JUSPAY_BATCH_ITEM_TIMEOUT", "30"))
+
+# Result handles: tool results larger than JUSPAY_RESULT_MAX_BYTES (as JSON)
+# are kept server-side for JUSPAY_RESULT_HANDLE_TTL seconds and returned one
+# page at a time. The store holds at most JUSPAY_RESULT_STORE_MAX_BYTES.
+JUSPAY_RESULT_MAX_BYTES = int(os.getenv("JUSPAY_RESULT_MAX_BYTES", str(256 * 1024)))
+JUSPAY_RESULT_HANDLE_TTL = float(os.getenv("JUSPAY_RESULT_HANDLE_TTL", "900"))
+JUSPAY_RESULT_STORE_MAX_BYTES = int(os.getenv("JUSPAY_RESULT_STORE_MAX_BYTES", str(128 * 1024 * 1024)))
+
 def verify_env_vars():
     """ 
     Verifies that all required environment variables are set.
@@ -0,0 +1,113 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import os
+import json
+import logging
+
+from juspay_mcp.dispatch import RawJSON, parse_json
+from juspay_mcp.cache import AsyncTTLCache, hash_key
+from juspay_dashboard_mcp.config import (
+    JUSPAY_WEB_LOGIN_TOKEN,
+    JUSPAY_RESULT_MAX_BYTES,
+    JUSPAY_RESULT_HANDLE_TTL,
+    JUSPAY_RESULT_STORE_MAX_BYTES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Oversized results by handle. Each entry is (owner, rows, extra, row_bytes),
+# where owner is the hashed login token that created it and extra holds the
+# non-row keys of the response (e.g. "summary").
+_result_store = AsyncTTLCache(
+    ttl=JUSPAY_RESULT_HANDLE_TTL,
+    max_entries=1024,
+    max_bytes=JUSPAY_RESULT_STORE_MAX_BYTES,
+    sizeof=lambda entry: entry[3],
+)
+
+
+def _owner(meta_info: dict = None) -> str:
+    token = (meta_info or {}).get("x-web-logintoken") or JUSPAY_WEB_LOGIN_TOKEN or ""
+    return hash_key(token)
+
+
+def _split_rows(response):
+    if isinstance(response, list) and all(isinstance(row, dict) for row in response):
+        return response, {}
+    if isinstance(response, dict) and isinstance(response.get("rows"), list):
+        return response["rows"], {key: value for key, value in response.items() if key != "rows"}
+    return None, None
+
+
+def _page(handle: str, rows: list, extra: dict, offset: int, limit: int) -> dict:
+    end = min(offset + limit, len(rows))
+    return {
+        **extra,
+        "handle": handle,
+        "total_rows": len(rows),
+        "offset": offset,
+        "next_offset": end if end < len(rows) else None,
+        "rows": rows[offset:end],
+    }
+
+
+def page_oversized_result(response, meta_info: dict = None):
+    """
+    Stores a result that is larger than JUSPAY_RESULT_MAX_BYTES and returns its first page.
+
+    Only row results (a list of objects, or an object with a "rows" list)
+    are paged; the page size is chosen so that a page stays within
+    JUSPAY_RESULT_MAX_BYTES on average. Smaller results, and results without
+    rows, are returned unchanged.
+
+    Returns:
+        The response, or a page dict with the non-row keys of the response,
+        'handle', 'total_rows', 'offset', 'next_offset' and 'rows'.
+    """
+    size = len(response.text) if isinstance(response, RawJSON) else len(json.dumps(response))
+    if size <= JUSPAY_RESULT_MAX_BYTES:
+        return response
+    rows, extra = _split_rows(parse_json(response))
+    if not rows:
+        return response
+
+    page_size = max(1, len(rows) * JUSPAY_RESULT_MAX_BYTES // size)
+    handle = os.urandom(16).hex()
+    _result_store.set(handle, (_owner(meta_info), rows, extra, size))
+    if _result_store.get(handle) is None:
+        logger.warning(f"Result of {size} bytes does not fit the result store; returning it whole")
+        return response
+    logger.info(f"Stored {len(rows)} rows ({size} bytes) under result handle {handle}")
+    return {**_page(handle, rows, extra, 0, page_size), "page_size": page_size}
+
+
+async def get_result_page(payload: dict, meta_info: dict = None) -> dict:
+    """
+    Returns a page of a result stored by page_oversized_result.
+
+    Args:
+        payload (dict): A dictionary containing:
+            - handle: The result handle returned by the original tool call
+            - offset: Index of the first row to return (default 0)
+            - limit: Number of rows to return (default: the page size
+              reported with the handle)
+
+    Returns:
+        dict: The non-row keys of the original response plus 'handle',
+            'total_rows', 'offset', 'next_offset' and 'rows'.
+
+    Raises:
+        ValueError: If the handle is unknown, expired or belongs to another login token.
+    """
+    handle = payload.get("handle")
+    entry = _result_store.get(handle) if handle else None
+    if entry is None or entry[0] != _owner(meta_info):
+        raise ValueError(f"Unknown or expired result handle: {handle}")
+    _, rows, extra, size = entry
+    offset = payload.get("offset") or 0
+    limit = payload.get("limit") or max(1, len(rows) * JUSPAY_RESULT_MAX_BYTES // size)
+    return _page(handle, rows, extra, offset, limit)
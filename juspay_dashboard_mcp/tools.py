@@ -4,17 +4,17 @@
 # you may not use this file except in compliance with the License.
 # You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
 
-import json
 import mcp.types as types
-import inspect
 import logging
 from mcp.server.lowlevel import Server
 from mcp.server.sse import SseServerTransport
 
-from juspay_dashboard_mcp import response_schema
+from juspay_dashboard_mcp import response_schema, results
 from juspay_dashboard_mcp.api import *
 import juspay_dashboard_mcp.api_schema as api_schema
 import juspay_dashboard_mcp.utils as util
+import juspay_mcp.dispatch as dispatch
+from juspay_dashboard_mcp.config import JUSPAY_BATCH_CONCURRENCY, JUSPAY_BATCH_ITEM_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
@@ -97,6 +97,7 @@ AVAILABLE_TOOLS = [
         model=api_schema.user.JuspayListUsersV2Payload,
         handler=user.list_users_v2_juspay,
         response_schema=response_schema.list_users_v2_response_schema,
+        paged=True,
     ),
     util.make_api_config(
         name="juspay_get_conflict_settings",
@@ -160,6 +161,7 @@ AVAILABLE_TOOLS = [
         model=api_schema.orders.JuspayListOrdersV4Payload,
         handler=orders.list_orders_v4_juspay,
         response_schema=response_schema.list_orders_v4_response_schema,
+        paged=True,
     ),
     util.make_api_config(
         name="juspay_get_order_details",
@@ -188,9 +190,45 @@ AVAILABLE_TOOLS = [
         model=api_schema.qapi.ToolQApiPayload,
         handler=qapi.q_api,
         response_schema=None,
+        paged=True,
+    ),
+    util.make_api_config(
+        name="q_api_batch",
+        description=api_schema.qapi.batch_api_description,
+        model=api_schema.qapi.ToolQApiBatchPayload,
+        handler=qapi.q_api_batch,
+        response_schema=None,
+    ),
+    util.make_api_config(
+        name="juspay_get_result_page",
+        description="Fetches a page of an oversized result. When juspay_list_orders_v4, juspay_list_users_v2 or q_api return a 'handle' and a 'next_offset', the rest of the rows are kept on the server for a limited time; call this tool with the handle and next_offset to get the next page instead of repeating the original query.",
+        model=api_schema.output.JuspayGetResultPagePayload,
+        handler=results.get_result_page,
+        response_schema=None,
     ),
 ]
 
+# run_tool is defined further down, so it is looked up when a batch runs.
+batch_call = dispatch.make_batch_call(
+    lambda name, arguments, meta_info: run_tool(name, arguments, meta_info),
+    JUSPAY_BATCH_CONCURRENCY,
+    JUSPAY_BATCH_ITEM_TIMEOUT,
+    format_result=lambda response, arguments: util.format_batch_result(response, arguments.get("output_format")),
+)
+
+AVAILABLE_TOOLS.append(
+    util.make_api_config(
+        name="batch_call",
+        description="Runs several tool calls of this server concurrently in one request and returns one result or error per call, in order. Use it instead of many separate calls, e.g. to get the details of several orders with juspay_get_order_details, or the configuration of several gateways with juspay_get_gateway_details, at once. Each entry is {\"name\": <tool name>, \"arguments\": <tool arguments>}; a failing or timed-out call does not affect the others.",
+        model=api_schema.batch.JuspayBatchCallPayload,
+        handler=batch_call,
+        response_schema=None,
+    )
+)
+
+# Name -> compiled tool, built once at import time.
+TOOL_REGISTRY = dispatch.compile_tools(AVAILABLE_TOOLS)
+
 @app.list_tools()
 async def list_my_tools() -> list[types.Tool]:
     return [
@@ -202,54 +240,37 @@ async def list_my_tools() -> list[types.Tool]:
         for tool in AVAILABLE_TOOLS
     ]
 
+async def run_tool(name: str, arguments: dict, meta_info: dict = None):
+    """
+    Validates and runs one tool call and returns its (projected, paged) response.
+
+    A juspay_meta_info in arguments takes precedence over meta_info. The
+    output_format argument is validated but left to the caller to apply
+    (handle_tool_calls, or batch_call for each of its calls).
+    """
+    tool = TOOL_REGISTRY.get(name)
+    if tool is None:
+        raise ValueError(f"Unknown tool: {name}")
+
+    meta_info = arguments.pop("juspay_meta_info", None) or meta_info
+    fields = arguments.pop(dispatch.PROJECTION_ARGUMENT, None)
+    projection = dispatch.parse_field_paths(fields) if fields else None
+    payload = tool.validate(arguments)
+    payload.pop("output_format", None)
+    response = await tool.invoke(payload, meta_info)
+    if projection:
+        response = dispatch.project_fields(response, projection)
+    if tool.paged:
+        response = results.page_oversized_result(response, meta_info)
+    return response
+
 @app.call_tool()
 async def handle_tool_calls(name: str, arguments: dict) -> list[types.TextContent]:
     logger.info(f"Tool called: {name} with arguments: {arguments}")
     try:
-        tool_entry = next((t for t in AVAILABLE_TOOLS if t["name"] == name), None)
-        if not tool_entry:
-            raise ValueError(f"Unknown tool: {name}")
-
-        schema = tool_entry["schema"]
-        required = schema.get("required", [])
-        missing = [key for key in required if key not in arguments]
-        if missing:
-            raise ValueError(f"Missing required fields for {name}: {missing}")
-
-        handler = tool_entry["handler"]
-        if not handler:
-            raise ValueError(f"No handler defined for tool: {name}")
-
-        model_cls = tool_entry.get("model")
-        if (model_cls):
-            try:
-                payload = model_cls(**arguments)  
-                payload_dict = payload.dict(exclude_none=True) 
-            except Exception as e:
-                raise ValueError(f"Validation error: {str(e)}")
-        else:
-            payload_dict = arguments 
-        
-        meta_info = arguments.pop("juspay_meta_info", None)
-
-        sig = inspect.signature(handler)
-        param_count = len(sig.parameters)
-
-        if param_count == 0:
-            response = await handler()
-
-        elif param_count == 1:
-            if arguments or not meta_info:
-                response = await handler(arguments)
-            else:
-                response = await handler(meta_info)
-
-        elif param_count == 2:
-            response = await handler(arguments, meta_info)
-
-        else:
-            raise ValueError(f"Unsupported number of parameters in tool handler: {param_count}")
-        return [types.TextContent(type="text", text=json.dumps(response))]
+        output_format = arguments.get("output_format")
+        response = await run_tool(name, arguments)
+        return [types.TextContent(type="text", text=util.format_response(response, output_format))]
 
     except Exception as e:
         logger.error(f"Error in tool execution: {e}")
@@ -4,18 +4,113 @@
 # you may not use this file except in compliance with the License.
 # You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
 
+import io
+import csv
 import json
 import os
+from juspay_mcp.dispatch import PROJECTION_ARGUMENT, PROJECTION_SCHEMA, RawJSON, parse_json
 
-def make_api_config(name, description, model, handler, response_schema=None):
+
+def make_api_config(name, description, model, handler, response_schema=None, paged=False):
     desc = description.strip()
     INCLUDE_RESPONSE_SCHEMA = os.getenv("INCLUDE_RESPONSE_SCHEMA")
     if INCLUDE_RESPONSE_SCHEMA == "true" and response_schema:
         desc += f"\nReturns response following this schema:\n{json.dumps(response_schema, indent=2)}"
+    schema = model.model_json_schema()
+    schema.setdefault("properties", {})[PROJECTION_ARGUMENT] = PROJECTION_SCHEMA
     return {
         "name": name,
         "description": desc,
         "model": model,
-        "schema": model.model_json_schema(),
+        "schema": schema,
         "handler": handler,
+        "paged": paged,
+    }
+
+
+def _columns(rows):
+    """Returns the union of row keys in order of first appearance."""
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+def _csv_cell(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return "" if value is None else value
+
+def to_columnar(rows):
+    """
+    Returns rows as {"columns": [...], "values": [[...], ...]} with one value
+    array per column; keys missing from a row become None.
+    """
+    columns = _columns(rows)
+    return {
+        "columns": columns,
+        "values": [[row.get(column) for row in rows] for column in columns],
     }
+
+def to_csv(rows):
+    """Returns rows as CSV text with a header line; nested values are written as JSON."""
+    columns = _columns(rows)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_cell(row.get(column)) for column in columns])
+    return buffer.getvalue()
+
+def format_response(response, output_format=None):
+    """
+    Serializes a tool response for the client.
+
+    With output_format "columnar" or "csv", the result rows (a list of objects,
+    or the "rows" list of an object response) are written in that compact
+    form. For "columnar" the other keys of an object response are kept
+    alongside; for "csv" they are written as "# key: value" lines above the
+    header. Responses without rows, such as errors, are returned as JSON.
+    Upstream bodies passed through as RawJSON are only parsed when they need
+    to be reformatted.
+    """
+    if output_format in (None, "json"):
+        return response.text if isinstance(response, RawJSON) else json.dumps(response)
+    response = parse_json(response)
+
+    split = _split_rows(response)
+    if split is None:
+        return json.dumps(response)
+    rows, extra = split
+
+    if output_format == "columnar":
+        return json.dumps(_columnar_result(rows, extra))
+    if output_format == "csv":
+        header = "".join(f"# {key}: {json.dumps(value)}\n" for key, value in extra.items())
+        return header + to_csv(rows)
+    raise ValueError(f"Unsupported output_format: {output_format}")
+
+def format_batch_result(response, output_format=None):
+    """
+    Returns one batch_call item result in output_format.
+
+    Works like format_response, except that the result is embedded in the
+    batch response: JSON and columnar results are returned as objects, and
+    only CSV results are returned as text.
+    """
+    response = parse_json(response)
+    if output_format in (None, "json"):
+        return response
+    split = _split_rows(response)
+    if split is None:
+        return response
+    if output_format == "columnar":
+        return _columnar_result(*split)
+    return format_response(response, output_format)
+
+def _split_rows(response):
+    """Returns (rows, other keys) of a response that has result rows, otherwise None."""
+    if isinstance(response, list) and all(isinstance(row, dict) for row in response):
+        return response, {}
+    if isinstance(response, dict) and isinstance(response.get("rows"), list):
+        return response["rows"], {key: value for key, value in response.items() if key != "rows"}
+    return None
+
+def _columnar_result(rows, extra):
+    return {**extra, "rows": to_columnar(rows)} if extra else to_columnar(rows)
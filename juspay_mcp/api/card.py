@@ -5,8 +5,30 @@
 # You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
 
 import httpx
-from juspay_mcp.config import ENDPOINTS
+import asyncio
+import logging
+from juspay_mcp.config import (
+    ENDPOINTS,
+    JUSPAY_MERCHANT_ID,
+    JUSPAY_BULK_CONCURRENCY,
+    JUSPAY_BIN_LIST_TTL,
+    JUSPAY_BIN_LIST_REFRESH_AHEAD,
+)
 from juspay_mcp.api.utils import call, post
+from juspay_mcp.bin_cache import BIN_MIN_LENGTH, bin_cache, normalize_bin
+from juspay_mcp.cache import AsyncTTLCache
+from juspay_mcp.instrument_cache import get_instruments, invalidate_cards, patch_card
+from juspay_mcp.progress import report_progress
+from juspay_mcp.ratelimit import merchant_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Columns of the bulk card BIN info table.
+BULK_CARD_INFO_COLUMNS = ["bin", "id", "brand", "type", "card_sub_type", "bank", "juspay_bank_code", "country"]
+
+# Eligible BIN lists by "merchant_id:auth_type". Each entry is the parsed
+# response plus a frozenset of its BINs for membership checks.
+_bin_lists = AsyncTTLCache(ttl=JUSPAY_BIN_LIST_TTL, refresh_ahead=JUSPAY_BIN_LIST_REFRESH_AHEAD, max_entries=64)
 
 async def add_card_juspay(payload: dict) -> dict:
     """
@@ -14,6 +36,8 @@ async def add_card_juspay(payload: dict) -> dict:
 
     This function sends an HTTP POST request to the Juspay Add Card endpoint.
     It stores the card details securely and returns a token for future use.
+    The customer's cached card lists are dropped, since the new card's
+    details are only known to upstream.
 
     Args:
         payload (dict): Must include:
@@ -49,14 +73,18 @@ async def add_card_juspay(payload: dict) -> dict:
         payload.pop("routing_id")
         
     api_url = ENDPOINTS["card_add"]
-    return await post(api_url, payload, routing_id)
+    response = await post(api_url, payload, routing_id, parse=True)
+    invalidate_cards(payload["customer_id"])
+    return response
 
 async def list_cards_juspay(payload: dict) -> dict:
     """
     Retrieves all stored cards for a specific customer.
 
     This function sends an HTTP GET request to the Juspay Cards endpoint.
-    It returns a list of all stored cards for the specified customer.
+    It returns a list of all stored cards for the specified customer. Lists
+    are cached per customer (see juspay_mcp.instrument_cache) and kept in
+    step with add_card_juspay, delete_card_juspay and update_card_juspay.
 
     Args:
         payload (dict): Must include:
@@ -79,24 +107,29 @@ async def list_cards_juspay(payload: dict) -> dict:
     routing_id = payload.get("routing_id", customer_id)
     
     api_url = f"{ENDPOINTS['cards']}?customer_id={customer_id}"
+    kind = "cards"
     
     if payload.get("options.check_cvv_less_support"):
         api_url += "&options.check_cvv_less_support=true"
+        kind = "cards_cvv_less"
     
-    return await call(api_url, routing_id)
+    return await get_instruments(customer_id, kind, lambda: call(api_url, routing_id, parse=True))
 
 async def delete_card_juspay(payload: dict) -> dict:
     """
     Deletes a saved card from the Juspay system.
 
     This function sends an HTTP POST request to the Juspay Card Delete endpoint.
-    It removes the specified card based on its token.
+    It removes the specified card based on its token, and from the cached
+    card lists of its customer.
 
     Args:
         payload (dict): Must include:
             - card_token (str): Unique token of the card to be deleted.
         May include:
             - routing_id (str): Custom routing identifier.
+            - customer_id (str): Owner of the card, used to update its cached
+              card lists; it is not sent to Juspay.
 
     Returns:
         dict: Parsed JSON response confirming deletion status.
@@ -112,16 +145,21 @@ async def delete_card_juspay(payload: dict) -> dict:
     routing_id = payload.get("routing_id")
     if "routing_id" in payload:
         payload.pop("routing_id")
+    customer_id = payload.pop("customer_id", None)
         
     api_url = ENDPOINTS["card_delete"]
-    return await post(api_url, payload, routing_id)
+    response = await post(api_url, payload, routing_id, parse=True)
+    if response.get("deleted"):
+        patch_card(card_token, customer_id)
+    return response
 
 async def update_card_juspay(payload: dict) -> dict:
     """
     Updates details for a saved card.
 
     This function sends an HTTP POST request to the Juspay Card Update endpoint.
-    It can be used to update card details such as nickname.
+    It can be used to update card details such as nickname. The new values
+    are applied to the card in the cached card lists of its customer.
 
     Args:
         payload (dict): Must include:
@@ -147,18 +185,25 @@ async def update_card_juspay(payload: dict) -> dict:
         payload.pop("routing_id")
         
     api_url = ENDPOINTS["card_update"]
-    return await post(api_url, payload, routing_id)
+    response = await post(api_url, payload, routing_id, parse=True)
+    changes = {k: v for k, v in payload.items() if k not in ("card_token", "customer_id")}
+    if changes:
+        patch_card(card_token, payload.get("customer_id"), changes)
+    return response
 
 async def get_card_info_juspay(payload: dict) -> dict:
     """
     Retrieves information about a specific card BIN (Bank Identification Number).
 
     This function sends an HTTP GET request to the Juspay Card BIN Info endpoint.
-    It provides details about the card type, issuing bank, etc.
+    It provides details about the card type, issuing bank, etc. Answers are
+    kept in the BIN cache (see juspay_mcp.bin_cache), so repeated lookups of
+    the same BIN range do not call upstream.
 
     Args:
         payload (dict): Must include:
-            - bin (str): First 6-9 digits of the card number (BIN).
+            - bin (str): First 6-8 digits of the card number (BIN); longer
+              values are cut to their first 8 digits.
         May include:
             - routing_id (str): Custom routing identifier.
 
@@ -166,17 +211,101 @@ async def get_card_info_juspay(payload: dict) -> dict:
         dict: Parsed JSON response containing card BIN information.
 
     Raises:
-        ValueError: If bin is missing.
+        ValueError: If bin is missing or shorter than 6 digits.
         Exception: If the API call fails.
     """
     bin_number = payload.get("bin")
     if not bin_number:
         raise ValueError("The payload must include 'bin'")
-        
+
     routing_id = payload.get("routing_id")
-    
-    api_url = f"{ENDPOINTS['card_info']}/{bin_number}"
-    return await call(api_url, routing_id)
+    return await bin_cache.get_or_fetch(normalize_bin(bin_number), _card_info_fetcher(routing_id))
+
+def _card_info_fetcher(routing_id: str | None):
+    async def fetch(bin_number: str) -> dict:
+        api_url = f"{ENDPOINTS['card_info']}/{bin_number}"
+        return await call(api_url, routing_id, parse=True)
+    return fetch
+
+async def get_card_info_bulk_juspay(payload: dict) -> dict:
+    """
+    Retrieves information about many card BINs at once.
+
+    BINs found in the BIN cache are answered directly. The misses are fetched
+    concurrently, at most JUSPAY_BULK_CONCURRENCY at a time and throttled by
+    the merchant's shared rate limiter, and a progress notification is sent
+    as each one completes.
+
+    Args:
+        payload (dict): Must include:
+            - bins (list[str]): BINs to look up; duplicates are looked up once.
+        May include:
+            - routing_id (str): Custom routing identifier.
+
+    Returns:
+        dict: {"columns": BULK_CARD_INFO_COLUMNS, "rows": [...], "failures": [{"bin": ..., "error": ...}],
+              "cached": <number of BINs answered from the cache>}, with rows in input order.
+
+    Raises:
+        ValueError: If 'bins' is missing or empty.
+    """
+    bins = list(dict.fromkeys(payload.get("bins") or []))
+    if not bins:
+        raise ValueError("The payload must include a non-empty 'bins' list.")
+
+    infos, errors, misses = {}, {}, {}
+    for bin_number in bins:
+        try:
+            key = normalize_bin(bin_number)
+        except ValueError as e:
+            errors[bin_number] = str(e)
+            continue
+        info = bin_cache.lookup(key)
+        if info is None:
+            misses[bin_number] = key
+        else:
+            infos[bin_number] = info
+    cached = len(infos)
+
+    fetch_info = _card_info_fetcher(payload.get("routing_id"))
+    semaphore = asyncio.Semaphore(JUSPAY_BULK_CONCURRENCY)
+    limiter = merchant_rate_limiter(JUSPAY_MERCHANT_ID)
+
+    async def throttled_fetch(bin_number: str) -> dict:
+        async with semaphore:
+            await limiter.acquire()
+            return await fetch_info(bin_number)
+
+    async def fetch(bin_number: str, key: str):
+        try:
+            return bin_number, await bin_cache.fetch_missing(key, throttled_fetch), None
+        except Exception as e:
+            return bin_number, None, str(e)
+
+    tasks = [asyncio.ensure_future(fetch(bin_number, key)) for bin_number, key in misses.items()]
+    try:
+        for done, next_result in enumerate(asyncio.as_completed(tasks), start=1):
+            bin_number, info, error = await next_result
+            if error is None:
+                infos[bin_number] = info
+            else:
+                errors[bin_number] = error
+            await report_progress(done, len(tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    logger.info(f"Bulk card info: {cached} cached, {len(misses)} fetched, {len(errors)} failed")
+    return {
+        "columns": BULK_CARD_INFO_COLUMNS,
+        "rows": [
+            [bin_number] + [infos[bin_number].get(column) for column in BULK_CARD_INFO_COLUMNS[1:]]
+            for bin_number in bins
+            if bin_number in infos
+        ],
+        "failures": [{"bin": bin_number, "error": errors[bin_number]} for bin_number in bins if bin_number in errors],
+        "cached": cached,
+    }
 
 async def get_bin_list_juspay(payload: dict) -> dict:
     """
@@ -184,6 +313,8 @@ async def get_bin_list_juspay(payload: dict) -> dict:
 
     This function sends an HTTP GET request to the Juspay BIN Eligibility endpoint.
     It returns a list of BINs that support the specified authentication type.
+    The list is cached per merchant and auth_type for JUSPAY_BIN_LIST_TTL
+    seconds and refreshed in the background while it is in use.
 
     Args:
         payload (dict): May include:
@@ -198,6 +329,58 @@ async def get_bin_list_juspay(payload: dict) -> dict:
     """
     auth_type = payload.get("auth_type", "OTP")
     routing_id = payload.get("routing_id")
-    
-    api_url = f"{ENDPOINTS['bin_list']}?auth_type={auth_type}"
-    return await call(api_url, routing_id)
\ No newline at end of file
+
+    response, _ = await _eligible_bins(auth_type, routing_id)
+    return response
+
+async def check_bin_eligibility_juspay(payload: dict) -> dict:
+    """
+    Checks whether a card BIN is eligible for an authentication type.
+
+    The check is answered from the cached eligibility list of the auth_type
+    (see get_bin_list_juspay); the list is only downloaded when it is not
+    cached yet. The BIN matches if it, or one of its prefixes of at least
+    6 digits, is in the list.
+
+    Args:
+        payload (dict): Must include:
+            - bin (str): BIN or card number to check; only the first 8 digits are used.
+        May include:
+            - auth_type (str): Authentication type (default 'OTP').
+            - routing_id (str): Custom routing identifier.
+
+    Returns:
+        dict: {"bin": <first 8 digits>, "auth_type": ..., "eligible": bool, "matched_bin": <listed BIN or None>}
+
+    Raises:
+        ValueError: If bin is missing or shorter than 6 digits.
+        Exception: If the eligibility list could not be fetched.
+    """
+    bin_number = payload.get("bin")
+    if not bin_number:
+        raise ValueError("The payload must include 'bin'")
+    digits = normalize_bin(bin_number)
+    auth_type = payload.get("auth_type") or "OTP"
+
+    _, bins = await _eligible_bins(auth_type, payload.get("routing_id"))
+    matched = next(
+        (digits[:length] for length in range(len(digits), BIN_MIN_LENGTH - 1, -1) if digits[:length] in bins),
+        None,
+    )
+    return {"bin": digits, "auth_type": auth_type, "eligible": matched is not None, "matched_bin": matched}
+
+def _eligible_bin(item) -> str | None:
+    if isinstance(item, dict):
+        item = item.get("bin") or item.get("id")
+    return str(item) if item else None
+
+async def _eligible_bins(auth_type: str, routing_id: str | None) -> tuple[dict, frozenset]:
+    """Returns the cached (response, BIN set) of an auth_type, loading it on a miss."""
+    async def load():
+        api_url = f"{ENDPOINTS['bin_list']}?auth_type={auth_type}"
+        response = await call(api_url, routing_id, parse=True)
+        bins = frozenset(filter(None, map(_eligible_bin, response.get("bins") or [])))
+        logger.info(f"Loaded {len(bins)} eligible BINs for auth_type {auth_type}")
+        return response, bins
+
+    return await _bin_lists.get_or_load(f"{JUSPAY_MERCHANT_ID}:{auth_type}", load)
\ No newline at end of file
@@ -5,8 +5,42 @@
 # You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
 
 import httpx
-from juspay_mcp.config import ENDPOINTS 
+import asyncio
+import logging
+from juspay_mcp.config import (
+    ENDPOINTS,
+    JUSPAY_MERCHANT_ID,
+    JUSPAY_CUSTOMER_CACHE_TTL,
+    JUSPAY_CUSTOMER_CACHE_MAX_ENTRIES,
+)
 from juspay_mcp.api.utils import call, post
+from juspay_mcp.cache import AsyncTTLCache
+from juspay_mcp.api.card import list_cards_juspay
+from juspay_mcp.api.upi import get_saved_payment_methods
+from juspay_mcp.api.wallet import list_wallets
+
+logger = logging.getLogger(__name__)
+
+# Customer profiles by "merchant_id:customer_id". Entries are stored under
+# both the Juspay customer id and the merchant's object_reference_id, since
+# the Get Customer API accepts either.
+_customers = AsyncTTLCache(ttl=JUSPAY_CUSTOMER_CACHE_TTL, max_entries=JUSPAY_CUSTOMER_CACHE_MAX_ENTRIES)
+
+def _customer_key(customer_id: str) -> str:
+    return f"{JUSPAY_MERCHANT_ID}:{customer_id}"
+
+def _cache_customer(customer: dict):
+    """Writes a customer returned by Juspay into the cache."""
+    # The client auth token of create calls is short-lived; never serve it from the cache.
+    profile = {k: v for k, v in customer.items() if k != "juspay"}
+    for customer_id in {profile.get("id"), profile.get("object_reference_id")} - {None}:
+        _customers.set(_customer_key(customer_id), profile)
+
+def _forget_customer(customer_id: str):
+    """Drops a customer from the cache, under all the ids it is stored by."""
+    cached = _customers.get(_customer_key(customer_id)) or {}
+    for cached_id in {customer_id, cached.get("id"), cached.get("object_reference_id")} - {None}:
+        _customers.invalidate(_customer_key(cached_id))
 
 async def get_customer_juspay(payload: dict) -> dict:
     """
@@ -14,6 +48,8 @@ async def get_customer_juspay(payload: dict) -> dict:
 
     This function sends an HTTP GET request to the Juspay Get Customer endpoint.
     The 'customer_id' from the payload is used both in the URL and as the routing_id header.
+    Profiles are cached per merchant for JUSPAY_CUSTOMER_CACHE_TTL seconds, and
+    concurrent reads of the same customer share one request.
 
     Args:
         payload (dict): Must include:
@@ -31,8 +67,11 @@ async def get_customer_juspay(payload: dict) -> dict:
     if not customer_id:
         raise ValueError("The payload must include 'customer_id'.")
 
-    api_url = ENDPOINTS["customer"].format(customer_id=customer_id)
-    return await call(api_url, customer_id)
+    async def load():
+        api_url = ENDPOINTS["customer"].format(customer_id=customer_id)
+        return await call(api_url, customer_id, parse=True)
+
+    return await _customers.get_or_load(_customer_key(customer_id), load)
 
 async def create_customer_juspay(payload: dict) -> dict:
     """
@@ -40,6 +79,7 @@ async def create_customer_juspay(payload: dict) -> dict:
     
     This function sends an HTTP POST request to the Juspay Create Customer endpoint.
     The payload should contain customer details like email, phone, name, etc.
+    The created customer is written into the customer cache.
     
     Args:
         payload (dict): Must include:
@@ -69,7 +109,9 @@ async def create_customer_juspay(payload: dict) -> dict:
     if payload.get("get_client_auth_token"):
         payload["options.get_client_auth_token"] = "true"
     
-    return await post(api_url, payload, routing_id)
+    customer = await post(api_url, payload, routing_id, parse=True)
+    _cache_customer(customer)
+    return customer
 
 async def update_customer_juspay(payload: dict) -> dict:
     """
@@ -77,6 +119,7 @@ async def update_customer_juspay(payload: dict) -> dict:
     
     This function sends an HTTP POST request to the Juspay Update Customer endpoint.
     The customer_id is used in the URL path, and other fields are sent in the payload.
+    The updated customer replaces any cached profile.
     
     Args:
         payload (dict): Must include:
@@ -107,4 +150,69 @@ async def update_customer_juspay(payload: dict) -> dict:
     routing_id = payload.get("routing_id", customer_id)
     
     api_url = ENDPOINTS["update_customer"].format(customer_id=customer_id)
-    return await post(api_url, update_data, routing_id)
\ No newline at end of file
+    try:
+        customer = await post(api_url, update_data, routing_id, parse=True)
+    finally:
+        # Whatever the outcome, the cached profile may no longer be current.
+        _forget_customer(customer_id)
+    _cache_customer(customer)
+    return customer
+
+async def get_customer_360_juspay(payload: dict) -> dict:
+    """
+    Retrieves a customer's profile, saved cards, saved payment methods and
+    wallets in one call.
+
+    The four lookups (get_customer_juspay, list_cards_juspay,
+    get_saved_payment_methods and list_wallets) run concurrently and share
+    their caches, so the call takes as long as the slowest of them. A
+    section that fails is returned as null and its error is listed under
+    'errors'; the other sections are still returned.
+
+    Args:
+        payload (dict): Must include:
+            - customer_id (str): Unique identifier of the customer.
+        May include:
+            - payment_method (list): Saved payment method types to retrieve (default ["UPI_COLLECT"]).
+            - routing_id (str): Custom routing identifier.
+
+    Returns:
+        dict: {"customer_id": ..., "customer": {...}, "cards": [...],
+              "saved_payment_methods": {...}, "wallets": [...], "errors": {<section>: <error>}}
+
+    Raises:
+        ValueError: If 'customer_id' is missing in the payload.
+    """
+    customer_id = payload.get("customer_id")
+    if not customer_id:
+        raise ValueError("The payload must include 'customer_id'.")
+
+    base = {"customer_id": customer_id}
+    if payload.get("routing_id"):
+        base["routing_id"] = payload["routing_id"]
+    saved_methods_payload = {**base}
+    if payload.get("payment_method"):
+        saved_methods_payload["payment_method"] = payload["payment_method"]
+
+    sections = {
+        "customer": (get_customer_juspay({**base}), lambda response: response),
+        "cards": (list_cards_juspay({**base}), lambda response: response.get("cards")),
+        "saved_payment_methods": (
+            get_saved_payment_methods(saved_methods_payload),
+            lambda response: response.get("saved_payment_methods"),
+        ),
+        "wallets": (list_wallets({**base}), lambda response: response.get("list")),
+    }
+    results = await asyncio.gather(*(call for call, _ in sections.values()), return_exceptions=True)
+
+    document, errors = {"customer_id": customer_id}, {}
+    for (section, (_, extract)), result in zip(sections.items(), results):
+        if isinstance(result, BaseException):
+            document[section] = None
+            errors[section] = str(result)
+        else:
+            document[section] = extract(result)
+    if errors:
+        logger.warning(f"Customer 360 for {customer_id} is missing {', '.join(errors)}")
+    document["errors"] = errors
+    return document
@@ -4,9 +4,47 @@
 # you may not use this file except in compliance with the License.
 # You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
 
+import re
+import time
 import httpx
-from juspay_mcp.config import ENDPOINTS 
+import asyncio
+import logging
+from juspay_mcp.config import (
+    ENDPOINTS,
+    JUSPAY_MERCHANT_ID,
+    JUSPAY_BULK_CONCURRENCY,
+    JUSPAY_ORDER_WAIT_TIMEOUT,
+    JUSPAY_ORDER_WAIT_MAX_TIMEOUT,
+    JUSPAY_ORDER_POLL_MIN_INTERVAL,
+    JUSPAY_ORDER_POLL_MAX_INTERVAL,
+    JUSPAY_ORDER_STORE_TTL,
+)
 from juspay_mcp.api.utils import call, post
+from juspay_mcp.api.offer import get_offer_order_status_juspay
+from juspay_mcp.order_store import order_store, TERMINAL_ORDER_STATUSES
+from juspay_mcp.progress import report_progress
+from juspay_mcp.ratelimit import merchant_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Columns of the bulk order status table.
+BULK_ORDER_STATUS_COLUMNS = ["order_id", "status", "amount", "txn_id"]
+
+# Consecutive failed polls after which waiters get the error.
+ORDER_POLL_MAX_ERRORS = 3
+
+def fresh_terminal_order(order_id: str) -> dict | None:
+    """
+    Returns the order as last pushed by webhook if it is in a terminal status
+    and was received within JUSPAY_ORDER_STORE_TTL seconds, otherwise None.
+    """
+    entry = order_store.get(order_id)
+    if entry is None:
+        return None
+    received_at, order = entry
+    if time.time() - received_at > JUSPAY_ORDER_STORE_TTL or order.get("status") not in TERMINAL_ORDER_STATUSES:
+        return None
+    return order
 
 async def order_status_api_juspay(payload: dict) -> dict:
     """
@@ -14,7 +52,8 @@ async def order_status_api_juspay(payload: dict) -> dict:
 
     This function sends an HTTP GET request to the Juspay Order Status endpoint.
     The 'order_id' from the payload is appended to the URL. If 'customer_id'
-    is present in the payload, it's used for the routing_id header.
+    is present in the payload, it's used for the routing_id header. A fresh
+    terminal status received by webhook is returned without calling upstream.
 
     Args:
         payload (dict): Must include:
@@ -34,11 +73,314 @@ async def order_status_api_juspay(payload: dict) -> dict:
     if not order_id:
         raise ValueError("The payload must include 'order_id'.")
 
+    stored = fresh_terminal_order(order_id)
+    if stored is not None:
+        logger.info(f"Serving status of order {order_id} from the webhook store")
+        return stored
+
     customer_id = payload.get("customer_id")
 
     api_url = ENDPOINTS["order_status"].format(order_id=order_id)
     return await call(api_url, customer_id)
 
+async def bulk_order_status_juspay(payload: dict) -> dict:
+    """
+    Retrieves the status of many Juspay orders concurrently.
+
+    Order status calls run over the pooled client with at most
+    JUSPAY_BULK_CONCURRENCY in flight and are throttled by the merchant's
+    shared rate limiter. A progress notification is sent as each order
+    completes.
+
+    Args:
+        payload (dict): Must include:
+            - order_ids (list[str]): Order IDs to check; duplicates are checked once.
+        May include:
+            - customer_id (str, optional): If provided, used for the x-routing-id header.
+
+    Returns:
+        dict: {"columns": ["order_id", "status", "amount", "txn_id"], "rows": [...],
+              "failures": [{"order_id": ..., "error": ...}]}, with rows in input order.
+
+    Raises:
+        ValueError: If 'order_ids' is missing or empty.
+    """
+    order_ids = list(dict.fromkeys(payload.get("order_ids") or []))
+    if not order_ids:
+        raise ValueError("The payload must include a non-empty 'order_ids' list.")
+
+    customer_id = payload.get("customer_id")
+    semaphore = asyncio.Semaphore(JUSPAY_BULK_CONCURRENCY)
+    limiter = merchant_rate_limiter(JUSPAY_MERCHANT_ID)
+
+    async def fetch(order_id: str):
+        async with semaphore:
+            await limiter.acquire()
+            api_url = ENDPOINTS["order_status"].format(order_id=order_id)
+            try:
+                return order_id, await call(api_url, customer_id, parse=True), None
+            except Exception as e:
+                return order_id, None, str(e)
+
+    rows, errors = {}, {}
+    tasks = [asyncio.ensure_future(fetch(order_id)) for order_id in order_ids]
+    try:
+        for done, next_result in enumerate(asyncio.as_completed(tasks), start=1):
+            order_id, response, error = await next_result
+            if error is None:
+                rows[order_id] = [order_id] + [response.get(column) for column in BULK_ORDER_STATUS_COLUMNS[1:]]
+            else:
+                errors[order_id] = error
+            await report_progress(done, len(order_ids))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    logger.info(f"Bulk order status: {len(rows)} succeeded, {len(errors)} failed")
+    return {
+        "columns": BULK_ORDER_STATUS_COLUMNS,
+        "rows": [rows[order_id] for order_id in order_ids if order_id in rows],
+        "failures": [
+            {"order_id": order_id, "error": errors[order_id]} for order_id in order_ids if order_id in errors
+        ],
+    }
+
+class _OrderStatusPoller:
+    """
+    Polls the status of one order until it is terminal, on behalf of every
+    waiter for that order.
+
+    The poll interval starts at JUSPAY_ORDER_POLL_MIN_INTERVAL, grows by half
+    while the status stays the same up to JUSPAY_ORDER_POLL_MAX_INTERVAL, and
+    drops back whenever the status changes. The loop stops when the order is
+    terminal, after ORDER_POLL_MAX_ERRORS consecutive failed polls, or when
+    the last waiter gives up.
+    """
+
+    def __init__(self, order_id: str, customer_id: str | None):
+        self.order_id = order_id
+        self.customer_id = customer_id
+        self.waiters = 0
+        self.latest = None
+        self.result = asyncio.get_running_loop().create_future()
+        self.task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        api_url = ENDPOINTS["order_status"].format(order_id=self.order_id)
+        limiter = merchant_rate_limiter(JUSPAY_MERCHANT_ID)
+        interval = JUSPAY_ORDER_POLL_MIN_INTERVAL
+        errors = 0
+        try:
+            while True:
+                await limiter.acquire()
+                try:
+                    response = await call(api_url, self.customer_id, parse=True)
+                    errors = 0
+                except Exception as e:
+                    errors += 1
+                    logger.warning(f"Status poll {errors} for order {self.order_id} failed: {e}")
+                    if errors >= ORDER_POLL_MAX_ERRORS:
+                        self.result.set_exception(e)
+                        return
+                else:
+                    status = response.get("status")
+                    if status in TERMINAL_ORDER_STATUSES:
+                        self.result.set_result(response)
+                        return
+                    previous = (self.latest or {}).get("status")
+                    self.latest = response
+                    if status != previous:
+                        interval = JUSPAY_ORDER_POLL_MIN_INTERVAL
+                    else:
+                        interval = min(interval * 1.5, JUSPAY_ORDER_POLL_MAX_INTERVAL)
+                await asyncio.sleep(interval)
+        finally:
+            if _order_pollers.get(self.order_id) is self:
+                del _order_pollers[self.order_id]
+
+
+# Running pollers by order_id, shared by concurrent waiters for the same order.
+_order_pollers: dict[str, _OrderStatusPoller] = {}
+
+
+def _on_stored_order(order: dict):
+    """Completes the poller of an order as soon as a webhook reports it terminal."""
+    poller = _order_pollers.get(order.get("order_id"))
+    if poller and order.get("status") in TERMINAL_ORDER_STATUSES and not poller.result.done():
+        poller.result.set_result(order)
+        poller.task.cancel()
+
+
+order_store.add_listener(_on_stored_order)
+
+
+async def wait_for_order_status_juspay(payload: dict) -> dict:
+    """
+    Waits server-side until a Juspay order reaches a terminal status or a deadline passes.
+
+    All concurrent waiters for the same order share one poll loop (see
+    _OrderStatusPoller), so waiting costs one upstream call per poll interval
+    regardless of how many callers wait. A terminal status received by webhook
+    ends the wait immediately.
+
+    Args:
+        payload (dict): Must include:
+            - order_id (str): Unique identifier of the order to wait for.
+        May include:
+            - customer_id (str, optional): If provided, used for the x-routing-id header.
+            - timeout (float, optional): Seconds to wait (default JUSPAY_ORDER_WAIT_TIMEOUT,
+              at most JUSPAY_ORDER_WAIT_MAX_TIMEOUT).
+
+    Returns:
+        dict: {"order_id", "status", "terminal", "waited_seconds", "order"}, where
+              order is the last order status response seen (None if no poll
+              succeeded before the deadline).
+
+    Raises:
+        ValueError: If 'order_id' is missing in the payload.
+        Exception: If the status could not be fetched ORDER_POLL_MAX_ERRORS times in a row.
+    """
+    order_id = payload.get("order_id")
+    if not order_id:
+        raise ValueError("The payload must include 'order_id'.")
+    timeout = min(payload.get("timeout") or JUSPAY_ORDER_WAIT_TIMEOUT, JUSPAY_ORDER_WAIT_MAX_TIMEOUT)
+
+    stored = fresh_terminal_order(order_id)
+    if stored is not None:
+        return {
+            "order_id": order_id,
+            "status": stored.get("status"),
+            "terminal": True,
+            "waited_seconds": 0,
+            "order": stored,
+        }
+
+    poller = _order_pollers.get(order_id)
+    if poller is None:
+        poller = _order_pollers[order_id] = _OrderStatusPoller(order_id, payload.get("customer_id"))
+    poller.waiters += 1
+    started = asyncio.get_running_loop().time()
+    try:
+        order = await asyncio.wait_for(asyncio.shield(poller.result), timeout)
+    except asyncio.TimeoutError:
+        order = poller.latest
+    finally:
+        poller.waiters -= 1
+        if poller.waiters == 0 and not poller.result.done():
+            poller.task.cancel()
+
+    status = (order or {}).get("status")
+    return {
+        "order_id": order_id,
+        "status": status,
+        "terminal": status in TERMINAL_ORDER_STATUSES,
+        "waited_seconds": round(asyncio.get_running_loop().time() - started, 3),
+        "order": order,
+    }
+
+def _snake_case(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+def _same_value(a, b) -> bool:
+    if a == b or str(a) == str(b):
+        return True
+    try:
+        return float(a) == float(b)
+    except (TypeError, ValueError):
+        return False
+
+async def get_order_360_juspay(payload: dict, meta_info: dict = None) -> dict:
+    """
+    Retrieves the API, offer and dashboard views of one order concurrently and
+    merges them into a single record.
+
+    order_status_api_juspay, get_offer_order_status_juspay and the dashboard's
+    order details (juspay_dashboard_mcp get_order_details_juspay) run in
+    parallel. Their order fields are merged into one 'order' record, in that
+    order of precedence: dashboard field names are converted to snake_case,
+    and a field that several views report with the same value appears once.
+    Fields the views disagree on are listed under 'discrepancies'. The
+    dashboard's transactions, notifications and webhooks are returned
+    alongside the record.
+
+    The dashboard view needs a dashboard login token, from juspay_meta_info
+    ('x-web-logintoken') or JUSPAY_WEB_LOGIN_TOKEN; without one, and for any
+    view that fails, the error is listed under 'errors' and the remaining
+    views are still merged.
+
+    Args:
+        payload (dict): Must include:
+            - order_id (str): Unique identifier of the order.
+        May include:
+            - customer_id (str): Customer identifier for routing purposes.
+        meta_info (dict, optional): Dashboard credentials, e.g. {"x-web-logintoken": ...}.
+
+    Returns:
+        dict: {"order_id": ..., "order": {...}, "transactions": ..., "notifications": ...,
+              "webhooks": ..., "discrepancies": {<field>: {<view>: <value>, ...}},
+              "errors": {<view>: <error>}}
+
+    Raises:
+        ValueError: If 'order_id' is missing.
+        Exception: If none of the views could be fetched.
+    """
+    order_id = payload.get("order_id")
+    if not order_id:
+        raise ValueError("The payload must include 'order_id'.")
+    customer_id = payload.get("customer_id")
+
+    views = {
+        "api": order_status_api_juspay({"order_id": order_id, "customer_id": customer_id}),
+        "offer": get_offer_order_status_juspay({"order_id": order_id, "routing_id": customer_id}),
+    }
+    errors = {}
+    from juspay_dashboard_mcp import config as dashboard_config
+    if (meta_info or {}).get("x-web-logintoken") or dashboard_config.JUSPAY_WEB_LOGIN_TOKEN:
+        from juspay_dashboard_mcp.api.orders import get_order_details_juspay
+        views["dashboard"] = get_order_details_juspay({"order_id": order_id}, meta_info)
+    else:
+        errors["dashboard"] = "No dashboard login token; set JUSPAY_WEB_LOGIN_TOKEN or pass juspay_meta_info."
+
+    results = await asyncio.gather(*views.values(), return_exceptions=True)
+    responses = {}
+    for view, result in zip(views, results):
+        if isinstance(result, BaseException):
+            errors[view] = str(result)
+        else:
+            # The core and dashboard packages each have their own RawJSON; both expose json().
+            responses[view] = result.json() if hasattr(result, "json") else result
+    if not responses:
+        raise Exception(f"Could not fetch order {order_id}: {errors}")
+
+    dashboard = responses.get("dashboard") or {}
+    order_views = {
+        "api": responses.get("api") or {},
+        "offer": responses.get("offer") or {},
+        "dashboard": {_snake_case(key): value for key, value in (dashboard.get("order") or {}).items()},
+    }
+    record, origin, discrepancies = {}, {}, {}
+    for view, fields in order_views.items():
+        for key, value in fields.items():
+            if value is None:
+                continue
+            if key not in record:
+                record[key], origin[key] = value, view
+            elif not _same_value(record[key], value):
+                discrepancies.setdefault(key, {origin[key]: record[key]})[view] = value
+
+    transactions = dashboard.get("transactions")
+    if discrepancies:
+        logger.info(f"Order 360 for {order_id}: views disagree on {', '.join(discrepancies)}")
+    return {
+        "order_id": order_id,
+        "order": record,
+        "transactions": transactions.get("list") if isinstance(transactions, dict) else transactions,
+        "notifications": dashboard.get("notifications"),
+        "webhooks": dashboard.get("webhooks"),
+        "discrepancies": discrepancies,
+        "errors": errors,
+    }
+
 async def create_order_juspay(payload: dict) -> dict:
     """
     Creates a new order in Juspay payment system.
@@ -4,9 +4,47 @@
 # you may not use this file except in compliance with the License.
 # You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
 
+import re
+import json
 import httpx
-from juspay_mcp.config import ENDPOINTS 
-from juspay_mcp.api.utils import call, post
+import asyncio
+import logging
+from juspay_mcp.config import ENDPOINTS, JUSPAY_MERCHANT_ID, JUSPAY_BULK_CONCURRENCY
+from juspay_mcp.api.utils import call, post, RawJSON
+from juspay_mcp.progress import report_progress
+from juspay_mcp.ratelimit import merchant_rate_limiter
+from juspay_mcp.refund_journal import refund_journal, REFUND_FIELDS, SENT, DONE, FAILED
+
+logger = logging.getLogger(__name__)
+
+# Columns of the bulk refund table.
+BULK_REFUND_COLUMNS = ["unique_request_id", "order_id", "txn_id", "amount", "state"]
+
+# unique_request_ids currently being sent by a bulk refund in this process.
+_refunds_in_flight: set[str] = set()
+
+# How Juspay rejects a refund whose unique_request_id it has already accepted.
+_DUPLICATE_REQUEST = re.compile(r"duplicate|already\s+(exists|used|present|processed)", re.IGNORECASE)
+
+async def _confirm_duplicate_refund(row: dict, error: str, routing_id: str | None) -> tuple[str, str | None, str | None]:
+    """
+    Resolves a refund that Juspay rejected as a duplicate of an earlier attempt.
+
+    For an order refund, the refund is looked up in the order status by its
+    unique_request_id. A txn refund cannot be looked up without its order, so
+    the duplicate response itself is kept as the confirmation.
+
+    Returns:
+        tuple: (state, response, error) to record in the refund journal.
+    """
+    if not row["order_id"]:
+        return DONE, error, None
+    api_url = ENDPOINTS["order_status"].format(order_id=row["order_id"])
+    order = await call(api_url, routing_id, parse=True)
+    for refund in order.get("refunds") or []:
+        if refund.get("unique_request_id") == row["unique_request_id"]:
+            return DONE, json.dumps(refund), None
+    return FAILED, None, f"Rejected as a duplicate, but order {row['order_id']} has no such refund: {error}"
 
 async def create_refund_juspay(payload: dict) -> dict:
     """
@@ -97,3 +135,141 @@ async def create_txn_refund_juspay(payload: dict) -> dict:
     api_url = ENDPOINTS["txn_refund"]
     return await post(api_url, refund_data, routing_id)
 
+async def bulk_refund_juspay(payload: dict) -> dict:
+    """
+    Sends many refunds, each exactly once, and resumes interrupted runs.
+
+    Every refund is written to the refund journal (JUSPAY_REFUND_JOURNAL_DB)
+    before it is sent, keyed by its unique_request_id. Refunds the journal
+    already has as DONE are not sent again, so a bulk refund can simply be
+    re-run after an error or a crash. Called without 'refunds', the tool
+    resumes every unfinished refund in the journal. Refunds that FAILED are
+    only retried with retry_failed, whether they are resumed or given again.
+    When Juspay rejects a refund that was sent before as a duplicate, the
+    earlier attempt went through: the refund is fetched from the order status
+    and marked DONE.
+    A unique_request_id that appears more than once in one call is not sent
+    and is reported as a failure. Refunds are sent with
+    create_refund_juspay (order_id) or create_txn_refund_juspay (txn_id), at
+    most JUSPAY_BULK_CONCURRENCY at a time and throttled by the merchant's
+    shared rate limiter, and a progress notification is sent as each one
+    completes.
+
+    Args:
+        payload (dict): May include:
+            - refunds (list[dict]): Refunds to send, each with unique_request_id,
+              amount and either order_id or txn_id.
+            - retry_failed (bool): Also retry refunds that failed before.
+            - routing_id (str): Custom routing identifier for refunds that do not have one.
+
+    Returns:
+        dict: {"columns": BULK_REFUND_COLUMNS, "rows": [...], "failures": [{"unique_request_id": ..., "error": ...}],
+              "sent": <refunds sent by this call>, "already_done": <refunds skipped as DONE>}
+
+    Raises:
+        ValueError: If a refund does not have exactly one of order_id and txn_id.
+    """
+    refunds = payload.get("refunds")
+    routing_id = payload.get("routing_id")
+    retry_failed = payload.get("retry_failed", False)
+    errors = {}
+
+    if refunds:
+        requested = {}
+        for refund in refunds:
+            if bool(refund.get("order_id")) == bool(refund.get("txn_id")):
+                raise ValueError(
+                    f"Refund '{refund.get('unique_request_id')}' must have exactly one of 'order_id' and 'txn_id'."
+                )
+            unique_request_id = refund["unique_request_id"]
+            if unique_request_id in requested or unique_request_id in errors:
+                errors[unique_request_id] = "Appears more than once in this request."
+                requested.pop(unique_request_id, None)
+                continue
+            requested[unique_request_id] = {"routing_id": routing_id, **refund}
+        journaled = await refund_journal.record(list(requested.values()))
+        rows = []
+        for unique_request_id, refund in requested.items():
+            row = journaled[unique_request_id]
+            if any(row[field] != refund.get(field) for field in REFUND_FIELDS if field != "routing_id"):
+                errors[unique_request_id] = "Conflicts with the journaled refund of the same unique_request_id."
+            rows.append(row)
+    else:
+        rows = await refund_journal.unfinished(include_failed=retry_failed)
+
+    for row in rows:
+        if row["state"] == FAILED and not retry_failed and row["unique_request_id"] not in errors:
+            errors[row["unique_request_id"]] = f"Failed before ({row['error']}); set retry_failed to retry."
+    to_send = [
+        row for row in rows
+        if row["state"] != DONE and row["unique_request_id"] not in errors
+    ]
+    for row in to_send:
+        if row["unique_request_id"] in _refunds_in_flight:
+            errors[row["unique_request_id"]] = "Already being sent by another bulk refund."
+    to_send = [row for row in to_send if row["unique_request_id"] not in errors]
+    _refunds_in_flight.update(row["unique_request_id"] for row in to_send)
+
+    semaphore = asyncio.Semaphore(JUSPAY_BULK_CONCURRENCY)
+    limiter = merchant_rate_limiter(JUSPAY_MERCHANT_ID)
+
+    async def send(row: dict):
+        unique_request_id = row["unique_request_id"]
+        request = {
+            "unique_request_id": unique_request_id,
+            "amount": row["amount"],
+            "routing_id": row["routing_id"] or routing_id,
+        }
+        async with semaphore:
+            await limiter.acquire()
+            await refund_journal.mark(unique_request_id, SENT)
+            try:
+                if row["order_id"]:
+                    response = await create_refund_juspay({**request, "order_id": row["order_id"]})
+                else:
+                    response = await create_txn_refund_juspay({**request, "txn_id": row["txn_id"]})
+            except Exception as e:
+                state, text, error = FAILED, None, str(e)
+                if row["state"] in (SENT, FAILED) and _DUPLICATE_REQUEST.search(error):
+                    try:
+                        state, text, error = await _confirm_duplicate_refund(row, error, request["routing_id"])
+                    except Exception as lookup_error:
+                        error = f"{error} (could not look up the earlier refund: {lookup_error})"
+                await refund_journal.mark(unique_request_id, state, response=text, error=error)
+                return unique_request_id, state, error
+            text = response.text if isinstance(response, RawJSON) else json.dumps(response)
+            await refund_journal.mark(unique_request_id, DONE, response=text)
+            return unique_request_id, DONE, None
+
+    states = {}
+    tasks = [asyncio.ensure_future(send(row)) for row in to_send]
+    try:
+        for done, next_result in enumerate(asyncio.as_completed(tasks), start=1):
+            unique_request_id, state, error = await next_result
+            states[unique_request_id] = state
+            if error is not None:
+                errors[unique_request_id] = error
+            await report_progress(done, len(tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
+        _refunds_in_flight.difference_update(row["unique_request_id"] for row in to_send)
+
+    already_done = sum(1 for row in rows if row["state"] == DONE)
+    logger.info(
+        f"Bulk refund: {len(tasks)} sent, {sum(1 for s in states.values() if s == DONE)} done, "
+        f"{already_done} already done, {len(errors)} failed"
+    )
+    return {
+        "columns": BULK_REFUND_COLUMNS,
+        "rows": [
+            [row[column] for column in BULK_REFUND_COLUMNS[:-1]] + [states.get(row["unique_request_id"], row["state"])]
+            for row in rows
+        ],
+        "failures": [
+            {"unique_request_id": unique_request_id, "error": error}
+            for unique_request_id, error in errors.items()
+        ],
+        "sent": len(tasks),
+        "already_done": already_done,
+    }
@@ -7,6 +7,7 @@
 import httpx
 from juspay_mcp.config import ENDPOINTS
 from juspay_mcp.api.utils import call, post
+from juspay_mcp.instrument_cache import get_instruments
 
 async def get_saved_payment_methods(payload: dict) -> dict:
     """
@@ -14,6 +15,7 @@ async def get_saved_payment_methods(payload: dict) -> dict:
 
     This function sends an HTTP POST request to the Juspay Customer Payment Methods endpoint.
     It returns information about the saved payment methods associated with the customer.
+    Responses are cached per customer and set of payment methods.
 
     Args:
         payload (dict): Must include:
@@ -39,7 +41,8 @@ async def get_saved_payment_methods(payload: dict) -> dict:
     api_url = ENDPOINTS["saved_payment_methods"].format(customer_id=customer_id)
     
     body = {"payment_method": payment_method}
-    return await post(api_url, body, routing_id)
+    kind = "upi:" + ",".join(sorted(payment_method))
+    return await get_instruments(customer_id, kind, lambda: post(api_url, body, routing_id, parse=True))
 
 async def upi_collect(payload: dict) -> dict:
     """
@@ -4,51 +4,115 @@
 # you may not use this file except in compliance with the License.
 # You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
 
+import sys
+import contextlib
 import httpx
-from juspay_mcp.config import get_json_headers
-import logging 
+from juspay_mcp.config import (
+    get_json_headers,
+    JUSPAY_BASE_URL,
+    JUSPAY_HTTP_TIMEOUT,
+    JUSPAY_HTTP_MAX_CONNECTIONS,
+    JUSPAY_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    JUSPAY_HTTP_KEEPALIVE_EXPIRY,
+)
+from juspay_mcp.dispatch import RawJSON
+import logging
 
 logger = logging.getLogger(__name__)
 
-async def call(api_url: str, customer_id: str | None = None, additional_headers: dict = None) -> dict:
+# One pooled client per upstream origin (scheme://host:port), shared by all tool calls.
+_clients: dict[str, httpx.AsyncClient] = {}
+
+def _origin(api_url: str) -> str:
+    url = httpx.URL(api_url)
+    return f"{url.scheme}://{url.netloc.decode('ascii')}"
+
+def get_client(api_url: str) -> httpx.AsyncClient:
+    """
+    Returns the shared AsyncClient for the upstream host of api_url.
+
+    Clients are created lazily on first use and keep their connections alive
+    between tool calls, so repeated calls to the same host skip the TCP and
+    TLS handshakes.
+    """
+    origin = _origin(api_url)
+    client = _clients.get(origin)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=JUSPAY_HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=JUSPAY_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=JUSPAY_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=JUSPAY_HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        _clients[origin] = client
+        logger.info(f"Opened pooled HTTP client for {origin}")
+    return client
+
+async def close_clients():
+    """Closes every pooled client and drops it from the registry."""
+    clients = list(_clients.items())
+    _clients.clear()
+    for origin, client in clients:
+        await client.aclose()
+        logger.info(f"Closed pooled HTTP client for {origin}")
+
+@contextlib.asynccontextmanager
+async def http_client_pool():
+    """
+    Keeps the pooled clients open for the lifetime of the server.
+
+    Warms up the client for JUSPAY_BASE_URL on entry and closes all
+    clients on exit, including the dashboard package's pooled clients when
+    a composite tool (get_order_360_juspay) has loaded it into this process.
+    """
+    get_client(JUSPAY_BASE_URL)
+    try:
+        yield
+    finally:
+        await close_clients()
+        dashboard_utils = sys.modules.get("juspay_dashboard_mcp.api.utils")
+        if dashboard_utils is not None:
+            await dashboard_utils.close_clients()
+
+async def call(api_url: str, customer_id: str | None = None, additional_headers: dict = None, parse: bool = False) -> dict | RawJSON:
     headers = get_json_headers(routing_id=customer_id)
-    
+
     if additional_headers:
         headers.update(additional_headers)
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            logger.info(f"Calling Juspay API at: {api_url} with headers: {headers}")
-            response = await client.get(api_url, headers=headers)
-            logger.info(f"Response: {response}")
-            response.raise_for_status()
-            response_data = response.json()
-            logger.info(f"Get API Response Data: {response_data}")
-            return response_data
-        except httpx.HTTPStatusError as e:
-            error_content = e.response.text if e.response else "Unknown error"
-            logger.error(f"HTTP error: {e.response.status_code if e.response else 'No response'} - {error_content}")
-            raise Exception(f"Juspay API HTTPError ({e.response.status_code if e.response else 'Unknown status'}): {error_content}") from e
-        except Exception as e:
-            logger.error(f"Error during Juspay API call: {e}")
-            raise Exception(f"Failed to call Juspay API: {e}") from e
-
-async def post(api_url: str, payload: dict, routing_id: str | None = None) -> dict:
+    client = get_client(api_url)
+    try:
+        logger.info(f"Calling Juspay API at: {api_url} with headers: {headers}")
+        response = await client.get(api_url, headers=headers)
+        logger.info(f"Response: {response}")
+        response.raise_for_status()
+        logger.info(f"Get API Response Data: {response.text}")
+        return response.json() if parse else RawJSON(response.text)
+    except httpx.HTTPStatusError as e:
+        error_content = e.response.text if e.response else "Unknown error"
+        logger.error(f"HTTP error: {e.response.status_code if e.response else 'No response'} - {error_content}")
+        raise Exception(f"Juspay API HTTPError ({e.response.status_code if e.response else 'Unknown status'}): {error_content}") from e
+    except Exception as e:
+        logger.error(f"Error during Juspay API call: {e}")
+        raise Exception(f"Failed to call Juspay API: {e}") from e
+
+async def post(api_url: str, payload: dict, routing_id: str | None = None, parse: bool = False) -> dict | RawJSON:
     effective_routing_id = routing_id or payload.get("customer_id")
-    headers = get_json_headers(routing_id=effective_routing_id) 
-
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            logger.info(f"Calling Juspay API at: {api_url} with body: {payload}")
-            response = await client.post(api_url, headers=headers, json=payload)
-            response.raise_for_status()
-            response_data = response.json()
-            logger.info(f"API Response Data: {response_data}")
-            return response_data
-        except httpx.HTTPStatusError as e:
-            error_content = e.response.text if e.response else "Unknown error"
-            logger.error(f"HTTP error: {e.response.status_code if e.response else 'No response'} - {error_content}")
-            raise Exception(f"Juspay API HTTPError ({e.response.status_code if e.response else 'Unknown status'}): {error_content}") from e
-        except Exception as e:
-            logger.error(f"Error during Juspay API call: {e}")
-            raise Exception(f"Failed to call Juspay API: {e}") from e
+    headers = get_json_headers(routing_id=effective_routing_id)
+
+    client = get_client(api_url)
+    try:
+        logger.info(f"Calling Juspay API at: {api_url} with body: {payload}")
+        response = await client.post(api_url, headers=headers, json=payload)
+        response.raise_for_status()
+        logger.info(f"API Response Data: {response.text}")
+        return response.json() if parse else RawJSON(response.text)
+    except httpx.HTTPStatusError as e:
+        error_content = e.response.text if e.response else "Unknown error"
+        logger.error(f"HTTP error: {e.response.status_code if e.response else 'No response'} - {error_content}")
+        raise Exception(f"Juspay API HTTPError ({e.response.status_code if e.response else 'Unknown status'}): {error_content}") from e
+    except Exception as e:
+        logger.error(f"Error during Juspay API call: {e}")
+        raise Exception(f"Failed to call Juspay API: {e}") from e
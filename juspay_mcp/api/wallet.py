@@ -7,12 +7,14 @@
 import httpx
 from juspay_mcp.config import ENDPOINTS
 from juspay_mcp.api.utils import call, post
+from juspay_mcp.instrument_cache import get_instruments
 
 async def list_wallets(payload: dict) -> dict:
     """
     Retrieves the list of wallets associated with a customer.
 
     This function sends an HTTP GET request to the Juspay List Wallets API endpoint.
+    Responses are cached per customer.
 
     Args:
         payload (dict): Must include:
@@ -34,4 +36,4 @@ async def list_wallets(payload: dict) -> dict:
     routing_id = payload.get("routing_id", customer_id)
     api_url = f"https://api.juspay.in/customers/{customer_id}/wallets"
 
-    return await call(api_url, routing_id)
+    return await get_instruments(customer_id, "wallets", lambda: call(api_url, routing_id, parse=True))
@@ -0,0 +1,31 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+class BatchCallItem(BaseModel):
+    name: str = Field(
+        ...,
+        description="Name of the tool to call."
+    )
+    arguments: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Arguments for the tool, exactly as for a direct call to it."
+    )
+
+class JuspayBatchCallPayload(BaseModel):
+    calls: List[BatchCallItem] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="The tool calls to run. They run concurrently; results are returned in the same order."
+    )
+    item_timeout: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Optional timeout in seconds for each call (default: JUSPAY_BATCH_ITEM_TIMEOUT)."
+    )
@@ -26,6 +26,7 @@ class JuspayListCardsPayload(WithRoutingId):
 
 class JuspayDeleteCardPayload(WithRoutingId):
     card_token: str = Field(..., description="Unique token of the card to be deleted.")
+    customer_id: Optional[str] = Field(None, description="Customer identifier associated with the card.")
 
 
 class JuspayUpdateCardPayload(WithRoutingId):
@@ -35,8 +36,17 @@ class JuspayUpdateCardPayload(WithRoutingId):
 
 
 class JuspayCardInfoPayload(WithRoutingId):
-    bin: str = Field(..., description="First 6-9 digits of the card number (BIN).")
+    bin: str = Field(..., description="First 6-8 digits of the card number (BIN). Longer values are cut to their first 8 digits.")
+
+
+class JuspayBulkCardInfoPayload(WithRoutingId):
+    bins: List[str] = Field(..., min_length=1, max_length=1000, description="BINs (first 6-8 digits of card numbers) to look up.")
 
 
 class JuspayBinListPayload(WithRoutingId):
     auth_type: Optional[str] = Field("OTP", description="Authentication type (e.g., 'OTP').")
+
+
+class JuspayCheckBinEligibilityPayload(WithRoutingId):
+    bin: str = Field(..., description="BIN or card number to check (first 6-8 digits are used).")
+    auth_type: Optional[str] = Field("OTP", description="Authentication type (e.g., 'OTP').")
@@ -5,7 +5,7 @@
 # You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
 
 from pydantic import Field
-from typing import Optional
+from typing import List, Optional
 from juspay_mcp.api_schema.routing import WithRoutingId
 
 class JuspayGetCustomerPayload(WithRoutingId):
@@ -45,3 +45,6 @@ class JuspayUpdateCustomerPayload(WithRoutingId):
                     "that helps track the payment session lifecycle (e.g., Order ID or Cart ID)."
     )
 
+class JuspayCustomer360Payload(WithRoutingId):
+    customer_id: str = Field(..., description="Unique identifier of the customer.")
+    payment_method: Optional[List[str]] = Field(None, description="Saved payment method types to retrieve (default ['UPI_COLLECT']).")
@@ -5,7 +5,7 @@
 # You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
 
 from pydantic import Field
-from typing import Optional, Literal
+from typing import Any, Dict, List, Optional, Literal
 from juspay_mcp.api_schema.routing import WithRoutingId
 
 
@@ -14,6 +14,26 @@ class JuspayOrderStatusPayload(WithRoutingId):
     customer_id: Optional[str] = Field(None, description="Customer identifier for routing purposes.")
 
 
+class JuspayBulkOrderStatusPayload(WithRoutingId):
+    order_ids: List[str] = Field(..., min_length=1, max_length=10000, description="Unique identifiers of the orders to check.")
+    customer_id: Optional[str] = Field(None, description="Customer identifier for routing purposes.")
+
+
+class JuspayOrder360Payload(WithRoutingId):
+    order_id: str = Field(..., description="Unique identifier of the order.")
+    customer_id: Optional[str] = Field(None, description="Customer identifier for routing purposes.")
+    juspay_meta_info: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Dashboard credentials for the dashboard view, e.g. {'x-web-logintoken': '...'} (default: JUSPAY_WEB_LOGIN_TOKEN).",
+    )
+
+
+class JuspayWaitForOrderStatusPayload(WithRoutingId):
+    order_id: str = Field(..., description="Unique identifier for the order to wait for.")
+    customer_id: Optional[str] = Field(None, description="Customer identifier for routing purposes.")
+    timeout: Optional[float] = Field(None, gt=0, description="Maximum number of seconds to wait for a terminal status (default 60, at most 300).")
+
+
 class JuspayOrderFulfillmentPayload(WithRoutingId):
     order_id: str = Field(..., description="Unique identifier of the order to update fulfillment status.")
     fulfillment_status: Literal["SUCCESS", "FAILURE", "PENDING"] = Field(
@@ -4,7 +4,8 @@
 # you may not use this file except in compliance with the License.
 # You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
 
-from pydantic import Field
+from typing import List, Optional
+from pydantic import BaseModel, Field
 from juspay_mcp.api_schema.routing import WithRoutingId
 
 class JuspayTxnRefundPayload(WithRoutingId):
@@ -17,3 +18,22 @@ class JuspayRefundPayload(WithRoutingId):
     order_id: str = Field(..., description="Unique identifier of the order to refund.")
     unique_request_id: str = Field(..., description="Unique refund request identifier (e.g., 'xyz123').")
     amount: str = Field(..., description="Refund amount as a string (e.g., '100.00').")
+
+
+class JuspayBulkRefundItem(BaseModel):
+    order_id: Optional[str] = Field(None, description="Order to refund; give either order_id or txn_id.")
+    txn_id: Optional[str] = Field(None, description="Transaction to refund; give either order_id or txn_id.")
+    unique_request_id: str = Field(..., description="Unique identifier of this refund; a refund is sent at most once per identifier.")
+    amount: str = Field(..., description="Refund amount as a string (e.g., '100.00').")
+
+
+class JuspayBulkRefundPayload(WithRoutingId):
+    refunds: Optional[List[JuspayBulkRefundItem]] = Field(
+        None,
+        max_length=10000,
+        description="Refunds to send. Leave out to resume the unfinished refunds in the journal.",
+    )
+    retry_failed: Optional[bool] = Field(
+        False,
+        description="Also retry refunds that failed before, both when resuming and for refunds given again in 'refunds'.",
+    )
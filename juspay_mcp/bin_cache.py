@@ -0,0 +1,201 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from juspay_mcp.config import JUSPAY_BIN_CACHE_TTL, JUSPAY_BIN_CACHE_MAX_ENTRIES, JUSPAY_BIN_CACHE_FILE
+
+logger = logging.getLogger(__name__)
+
+BIN_MIN_LENGTH = 6
+BIN_MAX_LENGTH = 8
+
+# Minimum number of seconds between two snapshot writes while serving.
+SNAPSHOT_INTERVAL = 60
+
+
+def normalize_bin(value: str) -> str:
+    """
+    Returns the cache key of a BIN or card number: its first BIN_MAX_LENGTH digits.
+
+    Raises:
+        ValueError: If value has fewer than BIN_MIN_LENGTH digits.
+    """
+    digits = "".join(ch for ch in str(value) if ch.isdigit())
+    if len(digits) < BIN_MIN_LENGTH:
+        raise ValueError(f"A BIN must have at least {BIN_MIN_LENGTH} digits: '{value}'")
+    return digits[:BIN_MAX_LENGTH]
+
+
+class BinInfoCache:
+    """
+    Card BIN metadata by BIN, with a longest-prefix lookup.
+
+    Each upstream answer is stored under the BIN that was asked for and under
+    the BIN range it resolved to (its 'id'). A lookup walks from the full BIN
+    down to BIN_MIN_LENGTH digits and uses the longest cached prefix, so an
+    8-digit BIN is served from a 6-digit range. A range stops answering for
+    longer BINs once a more specific range inside it has been seen, since
+    those BINs may belong to a different issuer product.
+
+    Entries expire ttl seconds after they were fetched (wall-clock time, so
+    the age survives restarts). When path is set, load() restores a JSON
+    snapshot and the cache is written back at most every SNAPSHOT_INTERVAL
+    seconds and on save().
+    """
+
+    def __init__(self, ttl: float, max_entries: int, path: str | None = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        # bin -> (fetched_at, info)
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        # Prefixes that contain a more specific BIN range.
+        self._split: set[str] = set()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self._saving: asyncio.Future | None = None
+
+    def lookup(self, bin_number: str) -> dict | None:
+        """Returns the cached info for a normalized BIN, or None on a miss."""
+        now = time.time()
+        for length in range(len(bin_number), BIN_MIN_LENGTH - 1, -1):
+            prefix = bin_number[:length]
+            entry = self._entries.get(prefix)
+            if entry is None or now - entry[0] > self.ttl:
+                continue
+            if length < len(bin_number) and prefix in self._split:
+                break
+            self._entries.move_to_end(prefix)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def store(self, bin_number: str, info: dict, fetched_at: float | None = None):
+        """Stores the upstream answer for a normalized BIN."""
+        fetched_at = fetched_at or time.time()
+        self._entries[bin_number] = (fetched_at, info)
+        self._entries.move_to_end(bin_number)
+        resolved = self._resolved_bin(bin_number, info)
+        if resolved is not None:
+            if resolved != bin_number:
+                self._entries[resolved] = (fetched_at, info)
+                self._entries.move_to_end(resolved)
+            self._mark_split(resolved)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+
+    async def get_or_fetch(self, bin_number: str, fetch: Callable[[str], Awaitable[dict]]) -> dict:
+        """
+        Returns the info for a normalized BIN, calling fetch(bin_number) on a miss.
+
+        Concurrent misses for the same BIN share one upstream call. Failed
+        fetches are not cached.
+        """
+        info = self.lookup(bin_number)
+        if info is not None:
+            return info
+        return await self.fetch_missing(bin_number, fetch)
+
+    async def fetch_missing(self, bin_number: str, fetch: Callable[[str], Awaitable[dict]]) -> dict:
+        """
+        Calls fetch(bin_number) for a BIN that lookup() has already missed.
+
+        Like get_or_fetch, but without a second lookup, so the miss is not
+        counted twice.
+        """
+        task = self._inflight.get(bin_number)
+        if task is None:
+            task = self._inflight[bin_number] = asyncio.ensure_future(self._fetch(bin_number, fetch))
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def load(self):
+        """Restores the snapshot at path, skipping entries that have expired."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read BIN cache snapshot {self.path}: {e}")
+            return
+        now = time.time()
+        for bin_number, fetched_at, info in snapshot.get("entries", []):
+            if now - fetched_at <= self.ttl:
+                self._entries[bin_number] = (fetched_at, info)
+                resolved = self._resolved_bin(bin_number, info)
+                if resolved is not None:
+                    self._mark_split(resolved)
+        self._dirty = False
+        logger.info(f"Loaded {len(self._entries)} BINs from {self.path}")
+
+    def save(self):
+        """Writes the snapshot to path, if persistence is enabled and anything changed."""
+        if self.path and self._dirty:
+            self._write(self._snapshot())
+
+    async def _fetch(self, bin_number: str, fetch: Callable[[str], Awaitable[dict]]) -> dict:
+        try:
+            info = await fetch(bin_number)
+            self.store(bin_number, info)
+            self._save_in_background()
+            return info
+        finally:
+            self._inflight.pop(bin_number, None)
+
+    def _save_in_background(self):
+        if (
+            not self.path
+            or (self._saving and not self._saving.done())
+            or time.monotonic() - self._saved_at < SNAPSHOT_INTERVAL
+        ):
+            return
+        self._saved_at = time.monotonic()
+        self._saving = asyncio.ensure_future(asyncio.to_thread(self._write, self._snapshot()))
+
+    def _snapshot(self) -> dict:
+        self._dirty = False
+        return {"entries": [[bin_number, fetched_at, info] for bin_number, (fetched_at, info) in self._entries.items()]}
+
+    def _write(self, snapshot: dict):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write BIN cache snapshot {self.path}: {e}")
+
+    @staticmethod
+    def _resolved_bin(bin_number: str, info: dict) -> str | None:
+        """Returns the BIN range an answer resolved to, or None if it names no range covering bin_number."""
+        resolved = str(info.get("id") or "")
+        if len(resolved) >= BIN_MIN_LENGTH and resolved.isdigit() and bin_number.startswith(resolved):
+            return resolved
+        return None
+
+    def _mark_split(self, resolved: str):
+        # Only a resolved range splits its prefixes; an answer that names no
+        # range must not stop shorter ranges from serving its siblings.
+        for length in range(BIN_MIN_LENGTH, len(resolved)):
+            self._split.add(resolved[:length])
+
+
+bin_cache = BinInfoCache(JUSPAY_BIN_CACHE_TTL, JUSPAY_BIN_CACHE_MAX_ENTRIES, JUSPAY_BIN_CACHE_FILE)
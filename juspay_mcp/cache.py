@@ -0,0 +1,185 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+def hash_key(value: str) -> str:
+    """Returns a stable, non-reversible cache key for a secret such as a login token."""
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+class AsyncTTLCache:
+    """
+    In-memory LRU cache with per-entry expiry for coroutine results.
+
+    Concurrent misses for the same key share a single in-flight load.
+    When refresh_ahead is set, an entry that is about to expire is reloaded
+    in the background while the current value keeps being served. A write
+    to a key (set, replace or invalidate) detaches any load of that key
+    that is in flight, so a load that started before the write never
+    stores its older value over it.
+
+    The cache is bounded by max_entries and, when sizeof is given, by
+    max_bytes as measured by sizeof(value); least recently used entries are
+    evicted first.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        refresh_ahead: float = 0.0,
+        max_entries: int = 1024,
+        max_bytes: int | None = None,
+        sizeof: Callable[[Any], int] | None = None,
+    ):
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        # key -> (expires_at, value, size)
+        self._entries: OrderedDict[str, tuple[float, Any, int]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the cached value for key, or default if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._discard(key)
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None):
+        """Stores value under key; a non-positive ttl only detaches a load in flight."""
+        self._inflight.pop(key, None)
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        size = self.sizeof(value) if self.sizeof else 0
+        self._discard(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def replace(self, key: str, value: Any) -> bool:
+        """
+        Swaps the value of a live entry without extending its expiry.
+
+        Returns False, and stores nothing, if key is missing or expired.
+        """
+        self._inflight.pop(key, None)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return False
+        size = self.sizeof(value) if self.sizeof else 0
+        self._entries[key] = (entry[0], value, size)
+        self._bytes += size - entry[2]
+        return True
+
+    def items(self) -> list[tuple[str, Any]]:
+        """Returns the (key, value) pairs of the live entries, without touching their recency."""
+        now = time.monotonic()
+        return [(key, value) for key, (expires_at, value, _) in self._entries.items() if expires_at > now]
+
+    def invalidate(self, key: str):
+        """Drops the entry for key, if any, and detaches a load of key in flight."""
+        self._inflight.pop(key, None)
+        self._discard(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._inflight.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "in_flight": len(self._inflight),
+        }
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+    ) -> Any:
+        """
+        Returns the cached value for key, calling loader on a miss.
+
+        Callers that miss while a load for the same key is running wait for
+        that load instead of starting their own. Failed loads are not cached.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            if self.refresh_ahead and entry[0] - now <= self.refresh_ahead and key not in self._inflight:
+                self._start_load(key, loader, ttl).add_done_callback(self._log_refresh_failure)
+            return entry[1]
+
+        self.misses += 1
+        task = self._inflight.get(key) or self._start_load(key, loader, ttl)
+        # Shield the shared load so one cancelled caller does not cancel it for the others.
+        return await asyncio.shield(task)
+
+    def loading(self) -> list[str]:
+        """Returns the keys that have a load in flight."""
+        return list(self._inflight)
+
+    def _start_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float | None) -> asyncio.Future:
+        task = asyncio.ensure_future(self._load(key, loader, ttl))
+        self._inflight[key] = task
+        return task
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float | None) -> Any:
+        task = asyncio.current_task()
+        try:
+            value = await loader()
+            # Only store the value if no write to key happened during the load.
+            if self._inflight.get(key) is task:
+                self.set(key, value, ttl)
+            return value
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+    def _discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Future):
+        if not task.cancelled() and task.exception():
+            logger.warning(f"Background cache refresh failed: {task.exception()}")
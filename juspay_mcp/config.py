@@ -23,6 +23,75 @@ else:
     JUSPAY_BASE_URL = os.getenv("JUSPAY_SANDBOX_BASE_URL", "https://sandbox.juspay.in")
     logger.info("Using Juspay Sandbox Environment")
 
+# Connection pool settings for the shared upstream HTTP clients.
+JUSPAY_HTTP_TIMEOUT = float(os.getenv("JUSPAY_HTTP_TIMEOUT", "30"))
+JUSPAY_HTTP_MAX_CONNECTIONS = int(os.getenv("JUSPAY_HTTP_MAX_CONNECTIONS", "100"))
+JUSPAY_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("JUSPAY_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+JUSPAY_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("JUSPAY_HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# batch_call: calls of one batch in flight at once, and the default timeout
+# in seconds for each call.
+JUSPAY_BATCH_CONCURRENCY = int(os.getenv("JUSPAY_BATCH_CONCURRENCY", "8"))
+JUSPAY_BATCH_ITEM_TIMEOUT = float(os.getenv("JUSPAY_BATCH_ITEM_TIMEOUT", "30"))
+
+# Bulk tools: upstream calls of one bulk request in flight at once, and the
+# maximum rate of upstream calls per merchant (requests per second, 0 = no limit).
+JUSPAY_BULK_CONCURRENCY = int(os.getenv("JUSPAY_BULK_CONCURRENCY", "10"))
+JUSPAY_MERCHANT_RATE_LIMIT = float(os.getenv("JUSPAY_MERCHANT_RATE_LIMIT", "20"))
+
+# wait_for_order_status_juspay: default and maximum wait in seconds, and the
+# bounds of the adaptive interval between upstream status polls.
+JUSPAY_ORDER_WAIT_TIMEOUT = float(os.getenv("JUSPAY_ORDER_WAIT_TIMEOUT", "60"))
+JUSPAY_ORDER_WAIT_MAX_TIMEOUT = float(os.getenv("JUSPAY_ORDER_WAIT_MAX_TIMEOUT", "300"))
+JUSPAY_ORDER_POLL_MIN_INTERVAL = float(os.getenv("JUSPAY_ORDER_POLL_MIN_INTERVAL", "1"))
+JUSPAY_ORDER_POLL_MAX_INTERVAL = float(os.getenv("JUSPAY_ORDER_POLL_MAX_INTERVAL", "10"))
+
+# Webhooks: Basic auth credentials configured for the webhook in the Juspay
+# dashboard (the endpoint is disabled unless both are set), the size of the
+# order status store they feed, how long a terminal status received by
+# webhook is served instead of calling upstream, an optional SQLite file the
+# store is persisted to, and how long terminal orders are kept in that file
+# (one day by default; it never holds more than the store's max entries).
+JUSPAY_WEBHOOK_USERNAME = os.getenv("JUSPAY_WEBHOOK_USERNAME")
+JUSPAY_WEBHOOK_PASSWORD = os.getenv("JUSPAY_WEBHOOK_PASSWORD")
+JUSPAY_ORDER_STORE_MAX_ENTRIES = int(os.getenv("JUSPAY_ORDER_STORE_MAX_ENTRIES", "100000"))
+JUSPAY_ORDER_STORE_TTL = float(os.getenv("JUSPAY_ORDER_STORE_TTL", "300"))
+JUSPAY_ORDER_STORE_DB = os.getenv("JUSPAY_ORDER_STORE_DB")
+JUSPAY_ORDER_STORE_RETENTION = float(os.getenv("JUSPAY_ORDER_STORE_RETENTION", str(24 * 3600)))
+
+# Card BIN info cache: how long BIN metadata is reused (30 days by default),
+# how many BINs are kept, and an optional JSON file the cache is snapshotted
+# to and restored from at startup.
+JUSPAY_BIN_CACHE_TTL = float(os.getenv("JUSPAY_BIN_CACHE_TTL", str(30 * 24 * 3600)))
+JUSPAY_BIN_CACHE_MAX_ENTRIES = int(os.getenv("JUSPAY_BIN_CACHE_MAX_ENTRIES", "100000"))
+JUSPAY_BIN_CACHE_FILE = os.getenv("JUSPAY_BIN_CACHE_FILE")
+
+# BIN eligibility lists: how long the list of an auth_type is reused, and how
+# long before expiry a list that is still in use is refreshed in the background.
+JUSPAY_BIN_LIST_TTL = float(os.getenv("JUSPAY_BIN_LIST_TTL", "3600"))
+JUSPAY_BIN_LIST_REFRESH_AHEAD = float(os.getenv("JUSPAY_BIN_LIST_REFRESH_AHEAD", "600"))
+
+# Customer profile cache: how long a customer fetched or written through this
+# server is reused, and how many customers are kept. A TTL of 0 disables it.
+JUSPAY_CUSTOMER_CACHE_TTL = float(os.getenv("JUSPAY_CUSTOMER_CACHE_TTL", "300"))
+JUSPAY_CUSTOMER_CACHE_MAX_ENTRIES = int(os.getenv("JUSPAY_CUSTOMER_CACHE_MAX_ENTRIES", "10000"))
+
+# Saved instruments cache (cards, saved UPI methods and wallets of a
+# customer): how long a list is reused, and how many lists are kept. A TTL
+# of 0 disables it.
+JUSPAY_INSTRUMENT_CACHE_TTL = float(os.getenv("JUSPAY_INSTRUMENT_CACHE_TTL", "120"))
+JUSPAY_INSTRUMENT_CACHE_MAX_ENTRIES = int(os.getenv("JUSPAY_INSTRUMENT_CACHE_MAX_ENTRIES", "10000"))
+
+# bulk_refund_juspay: SQLite file that journals every refund before it is
+# sent, so that retries and resumed runs never refund twice. Defaults to the
+# user's data directory, so the journal does not depend on the working
+# directory the server was started from.
+JUSPAY_REFUND_JOURNAL_DB = os.getenv("JUSPAY_REFUND_JOURNAL_DB") or os.path.join(
+    os.getenv("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share"),
+    "juspay-mcp",
+    "juspay_refunds.db",
+)
+
 
 ENDPOINTS = {
     "session": f"{JUSPAY_BASE_URL}/session",
@@ -0,0 +1,225 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import json
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+from pydantic import TypeAdapter
+
+logger = logging.getLogger(__name__)
+
+# Optional argument accepted by every tool: the response paths to keep.
+PROJECTION_ARGUMENT = "fields"
+PROJECTION_SCHEMA = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": (
+        "Optional list of response fields to return, as dot-separated paths "
+        "(e.g. [\"order_id\", \"status\", \"payment_gateway_response.resp_message\"]). "
+        "Paths apply to every element of a list (e.g. \"rows.orderId\"). "
+        "All other fields are left out of the response. Omit to get the full response."
+    ),
+}
+
+
+class RawJSON:
+    """
+    An upstream JSON body kept as text.
+
+    call() and post() return this instead of the parsed body so that tool
+    results that are passed through unchanged skip a parse and a re-serialize;
+    handle_tool_calls writes the text straight into the tool result. Use
+    json() where the body is actually inspected.
+    """
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+    def __repr__(self):
+        return f"RawJSON({self.text!r})"
+
+
+def parse_json(response):
+    """Returns response parsed if it is a RawJSON, otherwise unchanged."""
+    return response.json() if isinstance(response, RawJSON) else response
+
+
+@dataclass(frozen=True)
+class CompiledTool:
+    """A tool from AVAILABLE_TOOLS with its lookup, validation and calling convention resolved once."""
+    name: str
+    handler: Callable
+    adapter: Optional[TypeAdapter]
+    required: tuple
+    arity: int
+    paged: bool = False
+
+    def validate(self, arguments: dict) -> dict:
+        """
+        Validates the tool arguments and returns the payload for the handler.
+
+        The payload is the original arguments overlaid with the validated model
+        dumped with its aliases (limited to the fields the caller set), so
+        declared fields carry coerced values while keys the model does not
+        declare (e.g. 'merchant_id' next to 'merchantId') still reach the handler.
+        """
+        missing = [key for key in self.required if key not in arguments]
+        if missing:
+            raise ValueError(f"Missing required fields for {self.name}: {missing}")
+        if self.adapter is None:
+            return arguments
+        try:
+            payload = self.adapter.validate_python(arguments)
+        except Exception as e:
+            raise ValueError(f"Validation error: {str(e)}")
+        return {**arguments, **payload.model_dump(by_alias=True, exclude_unset=True)}
+
+    async def invoke(self, payload: dict, meta_info: Optional[dict] = None) -> Any:
+        """Calls the handler with the arguments its signature takes."""
+        if self.arity == 0:
+            return await self.handler()
+        if self.arity == 1:
+            return await self.handler(payload if payload or not meta_info else meta_info)
+        return await self.handler(payload, meta_info)
+
+
+def compile_tools(tools: list) -> dict:
+    """
+    Builds the dispatch table for handle_tool_calls from the tool configs.
+
+    Raises:
+        ValueError: If a tool has no handler or a handler takes more than two parameters.
+    """
+    registry = {}
+    for tool in tools:
+        handler = tool["handler"]
+        if not handler:
+            raise ValueError(f"No handler defined for tool: {tool['name']}")
+        arity = len(inspect.signature(handler).parameters)
+        if arity > 2:
+            raise ValueError(f"Unsupported number of parameters in tool handler: {arity}")
+        model = tool.get("model")
+        registry[tool["name"]] = CompiledTool(
+            name=tool["name"],
+            handler=handler,
+            adapter=TypeAdapter(model) if model else None,
+            required=tuple(tool["schema"].get("required", [])),
+            arity=arity,
+            paged=tool.get("paged", False),
+        )
+    return registry
+
+
+def parse_field_paths(fields):
+    """
+    Builds a projection tree from dot-separated paths.
+
+    fields may be a list of paths or a comma-separated field mask. In the
+    tree, None marks a field that is kept whole, so "a" wins over "a.b".
+
+    Raises:
+        ValueError: If fields is not a string or a list of strings.
+    """
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    if not isinstance(fields, list) or not all(isinstance(path, str) for path in fields):
+        raise ValueError(f"'{PROJECTION_ARGUMENT}' must be a list of dot-separated paths")
+    tree = {}
+    for path in fields:
+        keys = [key for key in path.strip().split(".") if key]
+        node = tree
+        for i, key in enumerate(keys):
+            if i == len(keys) - 1:
+                node[key] = None
+            elif node.get(key, {}) is None:
+                break
+            else:
+                node = node.setdefault(key, {})
+    return tree
+
+
+def _prune(value, tree):
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_prune(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: _prune(value[key], subtree) for key, subtree in tree.items() if key in value}
+    return value
+
+
+def project_fields(response, projection):
+    """
+    Returns response reduced to a projection tree from parse_field_paths.
+
+    Lists are projected element by element, and paths that do not exist
+    in the response are ignored. A RawJSON response is parsed first. Error
+    responses (objects with a truthy "error") are returned whole, so that a
+    failure is never projected into an empty result.
+    """
+    if not projection:
+        return response
+    response = parse_json(response)
+    if isinstance(response, dict) and response.get("error"):
+        return response
+    return _prune(response, projection)
+
+
+def make_batch_call(
+    run_tool: Callable[[str, dict, Optional[dict]], Awaitable[Any]],
+    concurrency: int,
+    item_timeout: float,
+    format_result: Optional[Callable[[Any, dict], Any]] = None,
+) -> Callable:
+    """
+    Returns the batch_call tool handler of a server whose calls go through run_tool.
+
+    At most concurrency calls are in flight at once and each one is bounded
+    by the batch's item_timeout (default item_timeout). Calls inherit the
+    batch's juspay_meta_info unless they carry their own. Each result is
+    passed through format_result(response, arguments of the call) when
+    given, so per-call output options apply; otherwise it is parsed JSON.
+    """
+
+    async def batch_call(payload: dict, meta_info: dict = None) -> list[dict]:
+        """
+        Runs several tool calls concurrently through the regular dispatch path.
+
+        Returns:
+            One {"index", "name", "result"} or {"index", "name", "error"} entry
+            per call, in input order.
+        """
+        calls = payload.get("calls") or []
+        timeout = payload.get("item_timeout") or item_timeout
+        semaphore = asyncio.Semaphore(concurrency)
+        logger.info(f"Running batch of {len(calls)} tool calls")
+
+        async def run_item(index: int, call: dict) -> dict:
+            name = call.get("name")
+            try:
+                if name == "batch_call":
+                    raise ValueError("batch_call cannot be nested")
+                arguments = call.get("arguments") or {}
+                async with semaphore:
+                    response = await asyncio.wait_for(run_tool(name, dict(arguments), meta_info), timeout)
+                result = format_result(response, arguments) if format_result else parse_json(response)
+                return {"index": index, "name": name, "result": result}
+            except asyncio.TimeoutError:
+                return {"index": index, "name": name, "error": f"Timed out after {timeout} seconds"}
+            except Exception as e:
+                logger.error(f"Batch item {index} ({name}) failed: {e}")
+                return {"index": index, "name": name, "error": str(e)}
+
+        return await asyncio.gather(*(run_item(i, call) for i, call in enumerate(calls)))
+
+    return batch_call
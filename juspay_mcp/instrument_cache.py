@@ -0,0 +1,100 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import logging
+from typing import Any, Awaitable, Callable
+
+from juspay_mcp.cache import AsyncTTLCache
+from juspay_mcp.config import JUSPAY_MERCHANT_ID, JUSPAY_INSTRUMENT_CACHE_TTL, JUSPAY_INSTRUMENT_CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+# Saved instruments by "merchant_id:customer_id:kind", where kind is "cards",
+# "cards_cvv_less", "upi:<payment methods>" or "wallets".
+_instruments = AsyncTTLCache(ttl=JUSPAY_INSTRUMENT_CACHE_TTL, max_entries=JUSPAY_INSTRUMENT_CACHE_MAX_ENTRIES)
+
+# Customer of each card token seen in a cached card list, so that card
+# mutations, which only carry the card token, can find the list to patch.
+_card_owners = AsyncTTLCache(ttl=JUSPAY_INSTRUMENT_CACHE_TTL, max_entries=JUSPAY_INSTRUMENT_CACHE_MAX_ENTRIES * 16)
+
+CARD_LIST_KINDS = ("cards", "cards_cvv_less")
+
+
+def _key(customer_id: str, kind: str) -> str:
+    return f"{JUSPAY_MERCHANT_ID}:{customer_id}:{kind}"
+
+
+async def get_instruments(customer_id: str, kind: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Returns the cached instruments of a kind for a customer, calling loader on a miss.
+
+    Concurrent misses for the same customer and kind share one upstream call.
+    """
+    if kind not in CARD_LIST_KINDS:
+        return await _instruments.get_or_load(_key(customer_id, kind), loader)
+
+    async def load_cards():
+        response = await loader()
+        for card in response.get("cards") or []:
+            if card.get("card_token"):
+                _card_owners.set(card["card_token"], customer_id)
+        return response
+
+    return await _instruments.get_or_load(_key(customer_id, kind), load_cards)
+
+
+def invalidate_cards(customer_id: str):
+    """Drops every cached card list of a customer."""
+    for kind in CARD_LIST_KINDS:
+        _instruments.invalidate(_key(customer_id, kind))
+
+
+def patch_card(card_token: str, customer_id: str | None = None, changes: dict | None = None):
+    """
+    Applies a card mutation to the cached card lists that hold the card.
+
+    With changes, the card's fields are updated in place; without, the card
+    is removed from the lists. The customer is found from the card token, or
+    taken from customer_id when the token has not been seen. Patched lists
+    keep their remaining TTL. If the customer is unknown, every cached card
+    list that holds the card is dropped instead. Card list loads in flight
+    that may return the card are detached, so they cannot store the list as
+    it was before the mutation.
+    """
+    customer_id = _card_owners.get(card_token) or customer_id
+    if not customer_id:
+        _invalidate_lists_with_card(card_token)
+        return
+    for kind in CARD_LIST_KINDS:
+        key = _key(customer_id, kind)
+        response = _instruments.get(key)
+        if response is None:
+            _instruments.invalidate(key)
+            continue
+        cards = []
+        for card in response.get("cards") or []:
+            if card.get("card_token") != card_token:
+                cards.append(card)
+            elif changes:
+                cards.append({**card, **changes})
+        # Replace rather than mutate: earlier callers may still hold the old response.
+        _instruments.replace(key, {**response, "cards": cards})
+    if not changes:
+        _card_owners.invalidate(card_token)
+    logger.info(f"Patched cached cards of customer {customer_id} for card {card_token}")
+
+
+def _invalidate_lists_with_card(card_token: str):
+    for key, response in _instruments.items():
+        if key.rsplit(":", 1)[-1] not in CARD_LIST_KINDS:
+            continue
+        if any(card.get("card_token") == card_token for card in response.get("cards") or []):
+            _instruments.invalidate(key)
+            logger.info(f"Dropped cached card list {key} holding card {card_token}")
+    # A list that is still loading may hold the card too.
+    for key in _instruments.loading():
+        if key.rsplit(":", 1)[-1] in CARD_LIST_KINDS:
+            _instruments.invalidate(key)
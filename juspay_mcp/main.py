@@ -6,6 +6,9 @@
 
 import click
 import os
+import hmac
+import time
+import base64
 import uvicorn
 import dotenv
 import asyncio
@@ -13,13 +16,22 @@ import logging
 import contextlib
 
 from starlette.applications import Starlette
+from starlette.responses import JSONResponse
 from starlette.routing import Mount, Route
 from mcp.server.sse import SseServerTransport
 from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 if os.getenv("JUSPAY_MCP_TYPE") == "DASHBOARD":
     from juspay_dashboard_mcp.tools import app
+    from juspay_dashboard_mcp.api.utils import http_client_pool, pool_stats
+    from juspay_dashboard_mcp.api.qapi import result_cache_stats
+    from juspay_dashboard_mcp.config import JUSPAY_STATS_ENDPOINT
 else:
     from juspay_mcp.tools import app
+    from juspay_mcp.api.utils import http_client_pool
+    from juspay_mcp.order_store import order_store
+    from juspay_mcp.bin_cache import bin_cache
+    from juspay_mcp.refund_journal import refund_journal
+    from juspay_mcp.config import JUSPAY_WEBHOOK_USERNAME, JUSPAY_WEBHOOK_PASSWORD
 from juspay_mcp.stdio import run_stdio
 
 # Load environment variables.
@@ -33,6 +45,45 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+def webhook_authorized(request) -> bool:
+    """Checks the Basic auth credentials configured for Juspay webhooks."""
+    scheme, _, encoded = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "basic":
+        return False
+    try:
+        username, _, password = base64.b64decode(encoded).partition(b":")
+    except ValueError:
+        return False
+    return hmac.compare_digest(username, JUSPAY_WEBHOOK_USERNAME.encode()) and hmac.compare_digest(
+        password, JUSPAY_WEBHOOK_PASSWORD.encode()
+    )
+
+async def handle_stats(request):
+    """Returns the upstream HTTP pool and Q API result cache statistics."""
+    return JSONResponse({"http_pools": pool_stats(), "qapi_result_cache": result_cache_stats()})
+
+async def handle_webhook(request):
+    """
+    Receives a Juspay order or refund webhook and records the order it carries
+    as the latest known status of that order.
+    """
+    if not webhook_authorized(request):
+        return JSONResponse({"error": "Unauthorized"}, status_code=401)
+    try:
+        event = await request.json()
+        order = event["content"]["order"]
+        order_id = order["order_id"]
+    except (ValueError, KeyError, TypeError):
+        return JSONResponse({"error": "Invalid webhook payload"}, status_code=400)
+
+    received_at = time.time()
+    if order_store.put(order, received_at):
+        await order_store.persist(order, received_at)
+        logger.info(f"Webhook {event.get('event_name')}: order {order_id} is {order.get('status')}")
+    else:
+        logger.info(f"Webhook {event.get('event_name')}: ignored stale update of order {order_id}")
+    return JSONResponse({"status": "ok"})
+
 @click.command()
 @click.option("--host", default="0.0.0.0", help="Host to bind the server to.")
 @click.option("--port", default=8000, type=int, help="Port to listen on for SSE.")
@@ -50,12 +101,18 @@ def main(host: str, port: int, mode: str):
     # Run in HTTP/SSE mode (default)
     # Define endpoint paths.
     message_endpoint_path = "/messages/"
+    webhook_endpoint_path = None
+    stats_endpoint_path = None
     if os.getenv("JUSPAY_MCP_TYPE") == "DASHBOARD":
         sse_endpoint_path = "/juspay-dashboard"
         streamable_endpoint_path = "/juspay-dashboard-stream"
+        if JUSPAY_STATS_ENDPOINT:
+            stats_endpoint_path = "/juspay-dashboard-stats"
     else:
         sse_endpoint_path = "/juspay"
         streamable_endpoint_path = "/juspay-stream"
+        if JUSPAY_WEBHOOK_USERNAME and JUSPAY_WEBHOOK_PASSWORD:
+            webhook_endpoint_path = "/juspay-webhooks"
     
     sse_transport_handler = SseServerTransport(message_endpoint_path)
     
@@ -97,24 +154,46 @@ def main(host: str, port: int, mode: str):
     @contextlib.asynccontextmanager
     async def lifespan(app):
         """Application lifespan context manager."""
-        async with streamable_session_manager.run():
-            logger.info("StreamableHTTP session manager started")
-            yield
-        logger.info("StreamableHTTP session manager stopped")
+        core = os.getenv("JUSPAY_MCP_TYPE") != "DASHBOARD"
+        if core:
+            bin_cache.load()
+        if webhook_endpoint_path:
+            order_store.load()
+        try:
+            async with http_client_pool(), streamable_session_manager.run():
+                logger.info("StreamableHTTP session manager started")
+                yield
+            logger.info("StreamableHTTP session manager stopped")
+        finally:
+            if core:
+                bin_cache.save()
+                refund_journal.close()
+            if webhook_endpoint_path:
+                order_store.close()
+
+    routes = [
+        Route(sse_endpoint_path, endpoint=handle_sse_connection),
+        Mount(message_endpoint_path, app=sse_transport_handler.handle_post_message),
+        Route(streamable_endpoint_path, endpoint=handle_streamable_http, methods=["GET", "POST", "DELETE"]),
+    ]
+    if webhook_endpoint_path:
+        routes.append(Route(webhook_endpoint_path, endpoint=handle_webhook, methods=["POST"]))
+    if stats_endpoint_path:
+        routes.append(Route(stats_endpoint_path, endpoint=handle_stats, methods=["GET"]))
 
     starlette_app = Starlette(
         debug=False,
         lifespan=lifespan,
-        routes=[
-            Route(sse_endpoint_path, endpoint=handle_sse_connection),
-            Mount(message_endpoint_path, app=sse_transport_handler.handle_post_message),
-            Route(streamable_endpoint_path, endpoint=handle_streamable_http, methods=["GET", "POST", "DELETE"]),
-        ],
+        routes=routes,
     )
 
     logger.info(f"Starting MCP server on:")
     logger.info(f"  SSE endpoint: http://{host}:{port}{sse_endpoint_path}")
     logger.info(f"  StreamableHTTP endpoint: http://{host}:{port}{streamable_endpoint_path}")
+    if webhook_endpoint_path:
+        logger.info(f"  Webhook endpoint: http://{host}:{port}{webhook_endpoint_path}")
+    if stats_endpoint_path:
+        logger.info(f"  Stats endpoint: http://{host}:{port}{stats_endpoint_path}")
     uvicorn.run(starlette_app, host=host, port=port)
 
 if __name__ == "__main__":
@@ -0,0 +1,162 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import json
+import time
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from juspay_mcp.config import (
+    JUSPAY_ORDER_STORE_MAX_ENTRIES,
+    JUSPAY_ORDER_STORE_DB,
+    JUSPAY_ORDER_STORE_RETENTION,
+)
+
+logger = logging.getLogger(__name__)
+
+# Order statuses after which the order no longer changes on its own.
+TERMINAL_ORDER_STATUSES = {
+    "CHARGED",
+    "PARTIAL_CHARGED",
+    "AUTHENTICATION_FAILED",
+    "AUTHORIZATION_FAILED",
+    "JUSPAY_DECLINED",
+    "AUTO_REFUNDED",
+    "COD_INITIATED",
+    "VOIDED",
+    "CAPTURE_FAILED",
+    "VOID_FAILED",
+}
+
+# Minimum number of seconds between two prunes of the SQLite table.
+PRUNE_INTERVAL = 600
+
+
+class OrderStatusStore:
+    """
+    Latest known state of each order, as pushed by Juspay webhooks.
+
+    Entries are kept in memory, least recently updated first out once
+    max_entries is reached. When db_path is set, every update is also
+    written to a SQLite table and load() restores the newest entries after
+    a restart. The table is pruned on load and at most every PRUNE_INTERVAL
+    seconds while writing: terminal orders received more than retention
+    seconds ago are deleted, and only the newest max_entries orders are
+    kept. Listeners are called with each order that is stored.
+    """
+
+    def __init__(self, max_entries: int, db_path: str | None = None, retention: float = 24 * 3600):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.retention = retention
+        # order_id -> (received_at, order)
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._listeners: list[Callable[[dict], None]] = []
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        self._pruned_at = 0.0
+
+    def add_listener(self, listener: Callable[[dict], None]):
+        self._listeners.append(listener)
+
+    def get(self, order_id: str) -> tuple[float, dict] | None:
+        """Returns (received_at, order) for order_id, where received_at is a time.time() value."""
+        return self._entries.get(order_id)
+
+    def put(self, order: dict, received_at: float | None = None) -> bool:
+        """
+        Stores order as the latest state of its order_id.
+
+        An update whose 'last_updated' is older than the stored one is ignored,
+        so webhooks delivered out of order do not roll the status back. An
+        update without 'last_updated' counts as older than a stored order
+        that has one.
+
+        Returns:
+            True if the order was stored.
+        """
+        order_id = order.get("order_id")
+        if not order_id:
+            raise ValueError("Order has no 'order_id'.")
+        current = self._entries.get(order_id)
+        current_updated = current[1].get("last_updated") if current else None
+        if current_updated and (order.get("last_updated") or "") < current_updated:
+            return False
+        received_at = received_at or time.time()
+        self._entries[order_id] = (received_at, order)
+        self._entries.move_to_end(order_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        for listener in self._listeners:
+            try:
+                listener(order)
+            except Exception as e:
+                logger.warning(f"Order store listener failed for {order_id}: {e}")
+        return True
+
+    async def persist(self, order: dict, received_at: float):
+        """Writes order to the SQLite table, if persistence is enabled."""
+        if self._db is not None:
+            await asyncio.to_thread(self._write, order, received_at)
+
+    def load(self):
+        """Opens the SQLite table and restores its newest entries into memory."""
+        if not self.db_path or self._db is not None:
+            return
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS order_status ("
+            "order_id TEXT PRIMARY KEY, status TEXT, received_at REAL, body TEXT)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS order_status_received_at ON order_status (received_at)"
+        )
+        self._prune()
+        rows = self._db.execute(
+            "SELECT received_at, body FROM order_status ORDER BY received_at DESC LIMIT ?",
+            (self.max_entries,),
+        ).fetchall()
+        for received_at, body in reversed(rows):
+            order = json.loads(body)
+            self._entries[order["order_id"]] = (received_at, order)
+        logger.info(f"Loaded {len(rows)} order states from {self.db_path}")
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _write(self, order: dict, received_at: float):
+        with self._db_lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO order_status (order_id, status, received_at, body) VALUES (?, ?, ?, ?)",
+                (order["order_id"], order.get("status"), received_at, json.dumps(order)),
+            )
+        if time.monotonic() - self._pruned_at >= PRUNE_INTERVAL:
+            self._prune()
+
+    def _prune(self):
+        self._pruned_at = time.monotonic()
+        statuses = sorted(TERMINAL_ORDER_STATUSES)
+        with self._db_lock, self._db:
+            expired = self._db.execute(
+                f"DELETE FROM order_status WHERE status IN ({', '.join('?' * len(statuses))}) AND received_at < ?",
+                (*statuses, time.time() - self.retention),
+            ).rowcount
+            evicted = self._db.execute(
+                "DELETE FROM order_status WHERE order_id NOT IN "
+                "(SELECT order_id FROM order_status ORDER BY received_at DESC LIMIT ?)",
+                (self.max_entries,),
+            ).rowcount
+        if expired or evicted:
+            logger.info(f"Pruned {expired} expired and {evicted} excess order states from {self.db_path}")
+
+
+order_store = OrderStatusStore(JUSPAY_ORDER_STORE_MAX_ENTRIES, JUSPAY_ORDER_STORE_DB, JUSPAY_ORDER_STORE_RETENTION)
@@ -0,0 +1,54 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import logging
+import contextlib
+from contextvars import ContextVar
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Sends a progress notification for the tool call being handled, if the
+# client asked for progress (by passing a progressToken).
+_reporter: ContextVar[Callable[[float, float | None], Awaitable[None]] | None] = ContextVar(
+    "progress_reporter", default=None
+)
+
+
+@contextlib.contextmanager
+def progress_scope(server):
+    """
+    Routes report_progress() calls made while handling the current MCP
+    request to the client that sent it.
+    """
+    try:
+        ctx = server.request_context
+    except LookupError:
+        ctx = None
+    progress_token = ctx.meta.progressToken if ctx and ctx.meta else None
+    if progress_token is None:
+        yield
+        return
+
+    async def send(progress: float, total: float | None):
+        await ctx.session.send_progress_notification(progress_token, progress, total)
+
+    reset_token = _reporter.set(send)
+    try:
+        yield
+    finally:
+        _reporter.reset(reset_token)
+
+
+async def report_progress(progress: float, total: float | None = None):
+    """Reports progress of the current tool call; a no-op when no client is listening."""
+    send = _reporter.get()
+    if send is None:
+        return
+    try:
+        await send(progress, total)
+    except Exception as e:
+        logger.warning(f"Failed to send progress notification: {e}")
@@ -0,0 +1,50 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import time
+import asyncio
+
+from juspay_mcp.config import JUSPAY_MERCHANT_RATE_LIMIT
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket that lets at most `rate` acquisitions per second through,
+    with bursts of up to `burst`. Waiters are served in arrival order.
+    A non-positive rate disables the limit.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None):
+        self.rate = rate
+        self.burst = burst or max(rate, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# One limiter per merchant, shared by every bulk tool that calls Juspay for it.
+_merchant_limiters: dict[str, AsyncRateLimiter] = {}
+
+def merchant_rate_limiter(merchant_id: str | None) -> AsyncRateLimiter:
+    """Returns the shared JUSPAY_MERCHANT_RATE_LIMIT limiter for merchant_id."""
+    key = merchant_id or ""
+    limiter = _merchant_limiters.get(key)
+    if limiter is None:
+        limiter = _merchant_limiters[key] = AsyncRateLimiter(JUSPAY_MERCHANT_RATE_LIMIT)
+    return limiter
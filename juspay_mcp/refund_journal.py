@@ -0,0 +1,126 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import os
+import time
+import asyncio
+import logging
+import sqlite3
+import threading
+
+from juspay_mcp.config import JUSPAY_REFUND_JOURNAL_DB
+
+logger = logging.getLogger(__name__)
+
+# Journal states of a refund.
+PENDING = "PENDING"  # journaled, never sent
+SENT = "SENT"  # sent at least once, outcome not recorded (e.g. the process died)
+DONE = "DONE"  # accepted by Juspay
+FAILED = "FAILED"  # rejected by Juspay or the call failed
+
+REFUND_FIELDS = ("unique_request_id", "order_id", "txn_id", "amount", "routing_id")
+_COLUMNS = REFUND_FIELDS + ("state", "attempts", "response", "error")
+
+
+class RefundJournal:
+    """
+    SQLite journal of bulk refunds, keyed by unique_request_id.
+
+    Every refund is written to the journal before it is sent and marked SENT
+    right before each attempt, so after a crash the journal tells which
+    refunds may still need sending. Juspay rejects a repeated
+    unique_request_id as a duplicate, which makes re-sending a SENT refund
+    safe. Database calls run in a worker thread.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    async def record(self, refunds: list[dict]) -> dict[str, dict]:
+        """
+        Journals refunds that are not journaled yet as PENDING.
+
+        Returns:
+            The journal row of every given unique_request_id, including ones
+            that were already journaled.
+        """
+        return await asyncio.to_thread(self._record, refunds)
+
+    async def unfinished(self, include_failed: bool = False) -> list[dict]:
+        """Returns the PENDING and SENT refunds (and FAILED ones if include_failed), oldest first."""
+        states = (PENDING, SENT, FAILED) if include_failed else (PENDING, SENT)
+        return await asyncio.to_thread(self._select, states)
+
+    async def mark(self, unique_request_id: str, state: str, response: str | None = None, error: str | None = None):
+        """Records the state of a refund; SENT also counts an attempt."""
+        await asyncio.to_thread(self._mark, unique_request_id, state, response, error)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS refunds ("
+                "unique_request_id TEXT PRIMARY KEY, order_id TEXT, txn_id TEXT, amount TEXT, routing_id TEXT, "
+                "state TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, response TEXT, error TEXT, "
+                "created_at REAL, updated_at REAL)"
+            )
+            logger.info(f"Opened refund journal {self.db_path}")
+        return self._db
+
+    def _rows(self, cursor) -> list[dict]:
+        return [dict(zip(_COLUMNS, row)) for row in cursor.fetchall()]
+
+    def _record(self, refunds: list[dict]) -> dict[str, dict]:
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            with db:
+                db.executemany(
+                    "INSERT OR IGNORE INTO refunds "
+                    "(unique_request_id, order_id, txn_id, amount, routing_id, state, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [tuple(refund.get(field) for field in REFUND_FIELDS) + (PENDING, now, now) for refund in refunds],
+                )
+            rows = {}
+            ids = [refund["unique_request_id"] for refund in refunds]
+            # Stay well below SQLite's limit on query parameters.
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                cursor = db.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM refunds "
+                    f"WHERE unique_request_id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                rows.update((row["unique_request_id"], row) for row in self._rows(cursor))
+            return rows
+
+    def _select(self, states: tuple[str, ...]) -> list[dict]:
+        with self._lock:
+            cursor = self._connect().execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM refunds "
+                f"WHERE state IN ({', '.join('?' * len(states))}) ORDER BY created_at",
+                states,
+            )
+            return self._rows(cursor)
+
+    def _mark(self, unique_request_id: str, state: str, response: str | None, error: str | None):
+        with self._lock, self._connect() as db:
+            db.execute(
+                "UPDATE refunds SET state = ?, attempts = attempts + ?, response = COALESCE(?, response), "
+                "error = ?, updated_at = ? WHERE unique_request_id = ?",
+                (state, 1 if state == SENT else 0, response, error, time.time(), unique_request_id),
+            )
+
+
+refund_journal = RefundJournal(JUSPAY_REFUND_JOURNAL_DB)
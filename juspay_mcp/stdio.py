@@ -16,25 +16,38 @@ logger = logging.getLogger(__name__)
 
 if os.getenv("JUSPAY_MCP_TYPE") == "DASHBOARD":
     from juspay_dashboard_mcp.tools import app
+    from juspay_dashboard_mcp.api.utils import http_client_pool
+    bin_cache = refund_journal = None
 else:
     from juspay_mcp.tools import app
+    from juspay_mcp.api.utils import http_client_pool
+    from juspay_mcp.bin_cache import bin_cache
+    from juspay_mcp.refund_journal import refund_journal
 
 async def run_stdio():
     """Runs the MCP server using stdio for input/output."""
     logger.info("Starting Juspay Tools in stdio mode...")
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="juspay",
-                server_version="0.1.0",
-                capabilities=app.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    if bin_cache:
+        bin_cache.load()
+    try:
+        async with http_client_pool(), mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="juspay",
+                    server_version="0.1.0",
+                    capabilities=app.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        if bin_cache:
+            bin_cache.save()
+        if refund_journal:
+            refund_journal.close()
 
 if __name__ == "__main__":
     logging.basicConfig(
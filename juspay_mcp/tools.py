@@ -6,15 +6,18 @@
 
 import json
 import mcp.types as types
-import inspect
 import logging
 from mcp.server.lowlevel import Server
 from mcp.server.sse import SseServerTransport
 
 from juspay_mcp import response_schema
 from juspay_mcp.api import *
+from juspay_mcp.api.utils import RawJSON
+import juspay_mcp.dispatch as dispatch
+from juspay_mcp.config import JUSPAY_BATCH_CONCURRENCY, JUSPAY_BATCH_ITEM_TIMEOUT
 import juspay_mcp.api_schema as api_schema
 import juspay_mcp.utils as util
+from juspay_mcp.progress import progress_scope
 
 logger = logging.getLogger(__name__)
 app = Server("juspay")
@@ -34,6 +37,27 @@ AVAILABLE_TOOLS = [
         handler=order.order_status_api_juspay,
         response_schema=response_schema.order_status_response_schema,
     ),
+    util.make_api_config(
+        name="bulk_order_status_juspay",
+        description="Retrieves the status of many Juspay orders at once from a list of `order_ids`. Returns a compact table with columns order_id, status, amount and txn_id, plus a list of the orders that could not be fetched and why. Sends progress notifications as orders complete.",
+        model=api_schema.order.JuspayBulkOrderStatusPayload,
+        handler=order.bulk_order_status_juspay,
+        response_schema=None,
+    ),
+    util.make_api_config(
+        name="wait_for_order_status_juspay",
+        description="Waits until a Juspay order reaches a terminal status (e.g. CHARGED, AUTHENTICATION_FAILED, AUTHORIZATION_FAILED, JUSPAY_DECLINED) or `timeout` seconds pass, and returns the latest order status. Use this after upi_collect, create_txn_juspay and similar flows instead of calling order_status_api_juspay in a loop.",
+        model=api_schema.order.JuspayWaitForOrderStatusPayload,
+        handler=order.wait_for_order_status_juspay,
+        response_schema=None,
+    ),
+    util.make_api_config(
+        name="get_order_360_juspay",
+        description="Retrieves everything known about one order in a single call: the order status API, the offer order status and, when a dashboard login token is configured, the dashboard order details (transactions, notifications, webhooks). The views are fetched concurrently and merged into one de-duplicated `order` record; fields the views disagree on are listed under `discrepancies` and views that failed under `errors`.",
+        model=api_schema.order.JuspayOrder360Payload,
+        handler=order.get_order_360_juspay,
+        response_schema=None,
+    ),
     util.make_api_config(
         name="create_refund_juspay",
         description="Initiates a refund for a specific Juspay order using its `order_id`.",
@@ -62,6 +86,13 @@ AVAILABLE_TOOLS = [
         handler=customer.update_customer_juspay,
         response_schema=response_schema.update_customer_response_schema,
     ),
+    util.make_api_config(
+        name="get_customer_360_juspay",
+        description="Retrieves everything needed for a customer's checkout context in one call: profile, saved cards, saved payment methods (UPI by default) and wallets. The lookups run concurrently; a section that fails is returned as null with its error under `errors`. Prefer this over calling get_customer_juspay, list_cards_juspay, get_saved_payment_methods and list_wallets one by one.",
+        model=api_schema.customer.JuspayCustomer360Payload,
+        handler=customer.get_customer_360_juspay,
+        response_schema=None,
+    ),
     util.make_api_config(
         name="order_fulfillment_sync_juspay",
         description="Updates the fulfillment status of a Juspay order.",
@@ -76,6 +107,13 @@ AVAILABLE_TOOLS = [
         handler=refund.create_txn_refund_juspay,
         response_schema=response_schema.txn_refund_response_schema,
     ),
+    util.make_api_config(
+        name="bulk_refund_juspay",
+        description="Sends many refunds at once (each by `order_id` or `txn_id`, with its own `unique_request_id` and `amount`) and guarantees each is sent at most once: refunds are journaled locally before sending and ones already completed are skipped, so the same list can safely be re-submitted. Call without `refunds` to resume unfinished refunds after an interruption. Returns a compact table of refund states plus failures, and sends progress notifications.",
+        model=api_schema.refund.JuspayBulkRefundPayload,
+        handler=refund.bulk_refund_juspay,
+        response_schema=None,
+    ),
     util.make_api_config(
         name="create_txn_juspay",
         description="Creates an order and processes payment in a single API call.",
@@ -125,6 +163,13 @@ AVAILABLE_TOOLS = [
         handler=card.get_card_info_juspay,
         response_schema=response_schema.card_info_response_schema,
     ),
+    util.make_api_config(
+        name="get_card_info_bulk_juspay",
+        description="Retrieves information about many card BINs at once from a list of `bins`. Returns a compact table with columns bin, id, brand, type, card_sub_type, bank, juspay_bank_code and country, plus a list of the BINs that could not be resolved and why. Cached BINs are answered without calling Juspay.",
+        model=api_schema.card.JuspayBulkCardInfoPayload,
+        handler=card.get_card_info_bulk_juspay,
+        response_schema=None,
+    ),
     util.make_api_config(
         name="get_bin_list_juspay",
         description="Retrieves a list of eligible BINs for a specific authentication type.",
@@ -132,6 +177,13 @@ AVAILABLE_TOOLS = [
         handler=card.get_bin_list_juspay,
         response_schema=response_schema.bin_list_response_schema,
     ),
+    util.make_api_config(
+        name="check_bin_eligibility_juspay",
+        description="Checks whether a card BIN is eligible for an authentication type (e.g. 'OTP'). Answers from the cached eligibility list, so prefer it over get_bin_list_juspay for yes/no questions about specific BINs.",
+        model=api_schema.card.JuspayCheckBinEligibilityPayload,
+        handler=card.check_bin_eligibility_juspay,
+        response_schema=None,
+    ),
     util.make_api_config(
         name="get_saved_payment_methods",
         description="Retrieves a customer's saved payment methods.",
@@ -197,6 +249,26 @@ AVAILABLE_TOOLS = [
     ),
 ]
 
+# run_tool is defined further down, so it is looked up when a batch runs.
+batch_call = dispatch.make_batch_call(
+    lambda name, arguments, meta_info: run_tool(name, arguments, meta_info),
+    JUSPAY_BATCH_CONCURRENCY,
+    JUSPAY_BATCH_ITEM_TIMEOUT,
+)
+
+AVAILABLE_TOOLS.append(
+    util.make_api_config(
+        name="batch_call",
+        description="Runs several tool calls of this server concurrently in one request and returns one result or error per call, in order. Use it instead of many separate calls, e.g. to fetch the status of many orders at once. Each entry is {\"name\": <tool name>, \"arguments\": <tool arguments>}; a failing or timed-out call does not affect the others.",
+        model=api_schema.batch.JuspayBatchCallPayload,
+        handler=batch_call,
+        response_schema=None,
+    )
+)
+
+# Name -> compiled tool, built once at import time.
+TOOL_REGISTRY = dispatch.compile_tools(AVAILABLE_TOOLS)
+
 @app.list_tools()
 async def list_my_tools() -> list[types.Tool]:
     return [
@@ -208,54 +280,34 @@ async def list_my_tools() -> list[types.Tool]:
         for tool in AVAILABLE_TOOLS
     ]
 
+async def run_tool(name: str, arguments: dict, meta_info: dict = None):
+    """
+    Validates and runs one tool call and returns its (projected) response.
+
+    A juspay_meta_info in arguments takes precedence over meta_info.
+    """
+    tool = TOOL_REGISTRY.get(name)
+    if tool is None:
+        raise ValueError(f"Unknown tool: {name}")
+
+    meta_info = arguments.pop("juspay_meta_info", None) or meta_info
+    fields = arguments.pop(dispatch.PROJECTION_ARGUMENT, None)
+    projection = dispatch.parse_field_paths(fields) if fields else None
+    payload = tool.validate(arguments)
+    response = await tool.invoke(payload, meta_info)
+    if projection:
+        response = dispatch.project_fields(response, projection)
+    return response
+
 @app.call_tool()
 async def handle_tool_calls(name: str, arguments: dict) -> list[types.TextContent]:
     logger.info(f"Calling tool: {name} with args: {arguments}")
     try:
-        tool_entry = next((t for t in AVAILABLE_TOOLS if t["name"] == name), None)
-        if not tool_entry:
-            raise ValueError(f"Unknown tool: {name}")
-
-        schema = tool_entry["schema"]
-        required = schema.get("required", [])
-        missing = [key for key in required if key not in arguments]
-        if missing:
-            raise ValueError(f"Missing required fields for {name}: {missing}")
-
-        handler = tool_entry["handler"]
-        if not handler:
-            raise ValueError(f"No handler defined for tool: {name}")
-
-        model_cls = tool_entry.get("model")
-        if model_cls:
-            try:
-                payload = model_cls(**arguments)  
-                payload_dict = payload.dict(exclude_none=True) 
-            except Exception as e:
-                raise ValueError(f"Validation error: {str(e)}")
-        else:
-            payload_dict = arguments 
-        
-        meta_info = arguments.pop("juspay_meta_info", None)
-
-        sig = inspect.signature(handler)
-        param_count = len(sig.parameters)
-
-        if param_count == 0:
-            response = await handler()
-
-        elif param_count == 1:
-            if arguments or not meta_info:
-                response = await handler(arguments)
-            else:
-                response = await handler(meta_info)
-
-        elif param_count == 2:
-            response = await handler(arguments, meta_info)
-
-        else:
-            raise ValueError(f"Unsupported number of parameters in tool handler: {param_count}")
-        return [types.TextContent(type="text", text=json.dumps(response))]
+        with progress_scope(app):
+            response = await run_tool(name, arguments)
+        # Upstream bodies that no handler transformed are passed through as-is.
+        text = response.text if isinstance(response, RawJSON) else json.dumps(response)
+        return [types.TextContent(type="text", text=text)]
 
     except Exception as e:
         logger.error(f"Error executing tool {name}: {e}")
@@ -0,0 +1,45 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import asyncio
+
+from juspay_mcp.api import card
+from juspay_mcp.bin_cache import BinInfoCache
+
+
+def test_unresolved_answer_does_not_split_its_prefixes():
+    cache = BinInfoCache(ttl=3600, max_entries=100)
+    cache.store("411111", {"id": "411111", "brand": "VISA"})
+    cache.store("41111122", {"brand": "VISA"})
+
+    assert cache.lookup("41111133") == {"id": "411111", "brand": "VISA"}
+
+
+def test_resolved_range_splits_its_prefixes():
+    cache = BinInfoCache(ttl=3600, max_entries=100)
+    cache.store("411111", {"id": "411111", "brand": "VISA"})
+    cache.store("41111122", {"id": "4111112", "brand": "VISA", "type": "CREDIT"})
+
+    assert cache.lookup("41111125") == {"id": "4111112", "brand": "VISA", "type": "CREDIT"}
+    assert cache.lookup("41111133") is None
+
+
+def test_bulk_counts_each_miss_once(monkeypatch):
+    cache = BinInfoCache(ttl=3600, max_entries=100)
+    cache.store("522222", {"id": "522222", "brand": "MASTERCARD"})
+    monkeypatch.setattr(card, "bin_cache", cache)
+
+    async def fetch_info(bin_number):
+        return {"id": bin_number, "brand": "VISA"}
+
+    monkeypatch.setattr(card, "_card_info_fetcher", lambda routing_id: fetch_info)
+
+    result = asyncio.run(card.get_card_info_bulk_juspay({"bins": ["411111", "422222", "52222211"]}))
+
+    assert result["cached"] == 1
+    assert len(result["rows"]) == 3
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
@@ -0,0 +1,81 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import asyncio
+
+import pytest
+
+from juspay_mcp.api import refund
+from juspay_mcp.refund_journal import RefundJournal
+
+
+@pytest.fixture
+def journal(tmp_path, monkeypatch):
+    journal = RefundJournal(str(tmp_path / "refunds.db"))
+    monkeypatch.setattr(refund, "refund_journal", journal)
+    yield journal
+    journal.close()
+
+
+def test_duplicate_ids_are_reported_not_sent(journal, monkeypatch):
+    sent = []
+
+    async def fake_refund(payload):
+        sent.append(payload["unique_request_id"])
+        return {"status": "ok"}
+
+    monkeypatch.setattr(refund, "create_refund_juspay", fake_refund)
+    refunds = [
+        {"unique_request_id": "r1", "order_id": "o1", "amount": "10.00"},
+        {"unique_request_id": "r1", "order_id": "o1", "amount": "20.00"},
+        {"unique_request_id": "r2", "order_id": "o2", "amount": "5.00"},
+    ]
+
+    result = asyncio.run(refund.bulk_refund_juspay({"refunds": refunds}))
+
+    assert sent == ["r2"]
+    assert result["failures"] == [{"unique_request_id": "r1", "error": "Appears more than once in this request."}]
+
+
+def test_failed_refunds_are_retried_only_with_retry_failed(journal, monkeypatch):
+    outcomes = iter([Exception("gateway down"), {"status": "ok"}])
+
+    async def flaky_refund(payload):
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(refund, "create_refund_juspay", flaky_refund)
+    payload = {"refunds": [{"unique_request_id": "r1", "order_id": "o1", "amount": "10.00"}]}
+
+    first = asyncio.run(refund.bulk_refund_juspay(dict(payload)))
+    again = asyncio.run(refund.bulk_refund_juspay(dict(payload)))
+    retried = asyncio.run(refund.bulk_refund_juspay({**payload, "retry_failed": True}))
+
+    assert (first["sent"], again["sent"], retried["sent"]) == (1, 0, 1)
+    assert again["rows"][0][-1] == "FAILED"
+    assert retried["rows"][0][-1] == "DONE"
+
+
+def test_duplicate_response_to_a_resent_refund_confirms_it(journal, monkeypatch):
+    async def duplicate_refund(payload):
+        raise Exception('Juspay API HTTPError (400): {"error_message": "Duplicate unique_request_id"}')
+
+    async def order_status(api_url, routing_id=None, parse=False):
+        return {"order_id": "o1", "refunds": [{"unique_request_id": "r1", "status": "PENDING"}]}
+
+    monkeypatch.setattr(refund, "create_refund_juspay", duplicate_refund)
+    monkeypatch.setattr(refund, "call", order_status)
+    refunds = [{"unique_request_id": "r1", "order_id": "o1", "amount": "10.00"}]
+    asyncio.run(journal.record(refunds))
+    asyncio.run(journal.mark("r1", "SENT"))
+
+    result = asyncio.run(refund.bulk_refund_juspay({"refunds": refunds}))
+
+    assert result["rows"][0][-1] == "DONE"
+    assert result["failures"] == []
+    assert asyncio.run(journal.unfinished(include_failed=True)) == []
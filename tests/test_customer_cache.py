@@ -0,0 +1,38 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import asyncio
+
+from juspay_mcp.api import customer
+
+
+def test_update_during_slow_load_is_not_overwritten(monkeypatch):
+    profiles = {"cust_race": {"id": "cust_race", "first_name": "Old"}}
+    load_started = asyncio.Event()
+    release_load = asyncio.Event()
+
+    async def slow_call(api_url, routing_id=None, parse=False):
+        snapshot = dict(profiles["cust_race"])
+        load_started.set()
+        await release_load.wait()
+        return snapshot
+
+    async def fake_post(api_url, payload, routing_id=None, parse=False):
+        profiles["cust_race"] = {"id": "cust_race", "first_name": payload["first_name"]}
+        return dict(profiles["cust_race"])
+
+    monkeypatch.setattr(customer, "call", slow_call)
+    monkeypatch.setattr(customer, "post", fake_post)
+
+    async def scenario():
+        stale_read = asyncio.ensure_future(customer.get_customer_juspay({"customer_id": "cust_race"}))
+        await load_started.wait()
+        await customer.update_customer_juspay({"customer_id": "cust_race", "first_name": "New"})
+        release_load.set()
+        await stale_read
+        return await customer.get_customer_juspay({"customer_id": "cust_race"})
+
+    assert asyncio.run(scenario())["first_name"] == "New"
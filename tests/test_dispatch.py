@@ -0,0 +1,114 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import asyncio
+import dataclasses
+
+import juspay_mcp.tools as core_tools
+import juspay_dashboard_mcp.tools as dashboard_tools
+from juspay_mcp.api import card
+from juspay_dashboard_mcp.api import gateway
+
+
+def test_gateway_details_keeps_undeclared_keys(monkeypatch):
+    seen = {}
+
+    async def fake_host(meta_info=None):
+        return "https://portal.example"
+
+    async def fake_post(api_url, payload, additional_headers=None, meta_info=None, parse=False):
+        seen["url"], seen["payload"] = api_url, payload
+        return {"ok": True}
+
+    monkeypatch.setattr(gateway, "get_juspay_host_from_api", fake_host)
+    monkeypatch.setattr(gateway, "post", fake_post)
+
+    arguments = {"mga_id": 42, "merchantId": "merchant_1", "merchant_id": "merchant_1", "extra": "kept"}
+    response = asyncio.run(dashboard_tools.run_tool("juspay_get_gateway_details", arguments, {"x-web-logintoken": "t"}))
+
+    assert response == {"ok": True}
+    assert seen["url"] == "https://portal.example/api/ec/v1/gateway/42"
+    assert seen["payload"]["merchant_id"] == "merchant_1"
+    assert seen["payload"]["extra"] == "kept"
+
+
+def test_gateway_details_accepts_declared_merchant_id(monkeypatch):
+    async def fake_host(meta_info=None):
+        return "https://portal.example"
+
+    async def fake_post(api_url, payload, additional_headers=None, meta_info=None, parse=False):
+        return {"ok": True}
+
+    monkeypatch.setattr(gateway, "get_juspay_host_from_api", fake_host)
+    monkeypatch.setattr(gateway, "post", fake_post)
+
+    arguments = {"mga_id": 42, "merchantId": "merchant_1"}
+    assert asyncio.run(dashboard_tools.run_tool("juspay_get_gateway_details", arguments, {"x-web-logintoken": "t"})) == {"ok": True}
+
+
+def test_list_cards_keeps_dotted_option(monkeypatch):
+    urls = []
+
+    async def fake_call(api_url, customer_id=None, additional_headers=None, parse=False):
+        urls.append(api_url)
+        return {"customer_id": "cst_dispatch_test", "cards": []}
+
+    monkeypatch.setattr(card, "call", fake_call)
+
+    arguments = {"customer_id": "cst_dispatch_test", "options.check_cvv_less_support": True}
+    asyncio.run(core_tools.run_tool("list_cards_juspay", arguments))
+
+    assert urls == [
+        f"{card.ENDPOINTS['cards']}?customer_id=cst_dispatch_test&options.check_cvv_less_support=true"
+    ]
+
+
+def test_projection_keeps_error_responses(monkeypatch):
+    async def failing_handler(payload, meta_info=None):
+        return {"error": "Juspay API HTTPError (500): upstream failure"}
+
+    tool = dashboard_tools.TOOL_REGISTRY["juspay_get_order_details"]
+    monkeypatch.setitem(
+        dashboard_tools.TOOL_REGISTRY, tool.name, dataclasses.replace(tool, handler=failing_handler)
+    )
+
+    arguments = {"order_id": "order_1", "fields": ["order.status"]}
+    response = asyncio.run(dashboard_tools.run_tool(tool.name, arguments, {"x-web-logintoken": "t"}))
+
+    assert response == {"error": "Juspay API HTTPError (500): upstream failure"}
+
+
+def test_batch_call_runs_items_through_each_server(monkeypatch):
+    async def echo_handler(payload, meta_info=None):
+        return {"echo": payload.get("order_id"), "meta": meta_info}
+
+    for tools, name in ((core_tools, "order_status_api_juspay"), (dashboard_tools, "juspay_get_order_details")):
+        tool = tools.TOOL_REGISTRY[name]
+        monkeypatch.setitem(tools.TOOL_REGISTRY, name, dataclasses.replace(tool, handler=echo_handler, arity=2))
+
+        calls = [{"name": name, "arguments": {"order_id": "o1"}}, {"name": "batch_call", "arguments": {}}]
+        results = asyncio.run(tools.run_tool("batch_call", {"calls": calls}, {"x-web-logintoken": "t"}))
+
+        assert results[0] == {"index": 0, "name": name, "result": {"echo": "o1", "meta": {"x-web-logintoken": "t"}}}
+        assert results[1] == {"index": 1, "name": "batch_call", "error": "batch_call cannot be nested"}
+
+
+def test_batch_call_applies_output_format_per_item(monkeypatch):
+    async def rows_handler(payload, meta_info=None):
+        return [{"order_id": "o1", "status": "CHARGED"}, {"order_id": "o2", "status": "PENDING_VBV"}]
+
+    tool = dashboard_tools.TOOL_REGISTRY["juspay_get_result_page"]
+    monkeypatch.setitem(dashboard_tools.TOOL_REGISTRY, tool.name, dataclasses.replace(tool, handler=rows_handler))
+
+    calls = [
+        {"name": tool.name, "arguments": {"handle": "h", "output_format": output_format}}
+        for output_format in ("json", "columnar", "csv")
+    ]
+    results = asyncio.run(dashboard_tools.run_tool("batch_call", {"calls": calls}, {"x-web-logintoken": "t"}))
+
+    assert results[0]["result"] == [{"order_id": "o1", "status": "CHARGED"}, {"order_id": "o2", "status": "PENDING_VBV"}]
+    assert results[1]["result"] == {"columns": ["order_id", "status"], "values": [["o1", "o2"], ["CHARGED", "PENDING_VBV"]]}
+    assert results[2]["result"] == "order_id,status\no1,CHARGED\no2,PENDING_VBV\n"
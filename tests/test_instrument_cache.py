@@ -0,0 +1,76 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import asyncio
+
+from juspay_mcp import instrument_cache
+
+
+def _cache_cards(customer_id, tokens):
+    async def loader():
+        return {"cards": [{"card_token": token} for token in tokens]}
+
+    return asyncio.run(instrument_cache.get_instruments(customer_id, "cards", loader))
+
+
+def test_delete_with_unknown_owner_drops_lists_holding_the_card():
+    _cache_cards("cust_unknown_owner", ["tok_a", "tok_b"])
+    _cache_cards("cust_other", ["tok_c"])
+    instrument_cache._card_owners.invalidate("tok_a")
+
+    instrument_cache.patch_card("tok_a")
+
+    assert instrument_cache._instruments.get(instrument_cache._key("cust_unknown_owner", "cards")) is None
+    assert instrument_cache._instruments.get(instrument_cache._key("cust_other", "cards")) is not None
+
+
+def test_patch_keeps_remaining_ttl():
+    _cache_cards("cust_ttl", ["tok_d", "tok_e"])
+    key = instrument_cache._key("cust_ttl", "cards")
+    expires_at = instrument_cache._instruments._entries[key][0]
+
+    instrument_cache.patch_card("tok_d")
+
+    assert instrument_cache._instruments._entries[key][0] == expires_at
+    assert instrument_cache._instruments.get(key) == {"cards": [{"card_token": "tok_e"}]}
+
+
+def _race_delete(customer_id, card_token, delete):
+    lists = [[{"card_token": card_token}, {"card_token": "tok_kept"}]]
+    load_started = asyncio.Event()
+    release_load = asyncio.Event()
+
+    async def slow_loader():
+        snapshot = list(lists[0])
+        load_started.set()
+        await release_load.wait()
+        return {"cards": snapshot}
+
+    async def fresh_loader():
+        return {"cards": list(lists[0])}
+
+    async def scenario():
+        stale_read = asyncio.ensure_future(instrument_cache.get_instruments(customer_id, "cards", slow_loader))
+        await load_started.wait()
+        lists[0] = [{"card_token": "tok_kept"}]
+        delete()
+        release_load.set()
+        await stale_read
+        return await instrument_cache.get_instruments(customer_id, "cards", fresh_loader)
+
+    return asyncio.run(scenario())
+
+
+def test_delete_during_slow_load_is_not_overwritten():
+    cards = _race_delete("cust_race", "tok_race", lambda: instrument_cache.patch_card("tok_race", "cust_race"))
+
+    assert cards == {"cards": [{"card_token": "tok_kept"}]}
+
+
+def test_delete_with_unknown_owner_during_slow_load_is_not_overwritten():
+    cards = _race_delete("cust_race_unknown", "tok_race_unknown", lambda: instrument_cache.patch_card("tok_race_unknown"))
+
+    assert cards == {"cards": [{"card_token": "tok_kept"}]}
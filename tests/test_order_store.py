@@ -0,0 +1,54 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import time
+
+from juspay_mcp.order_store import OrderStatusStore
+
+
+def test_update_without_last_updated_is_older():
+    store = OrderStatusStore(max_entries=10)
+    store.put({"order_id": "o1", "status": "CHARGED", "last_updated": "2025-01-01T10:00:00Z"})
+
+    assert not store.put({"order_id": "o1", "status": "PENDING_VBV"})
+    assert store.get("o1")[1]["status"] == "CHARGED"
+
+
+def test_load_prunes_expired_terminal_orders(tmp_path):
+    db_path = str(tmp_path / "orders.db")
+    store = OrderStatusStore(max_entries=10, db_path=db_path, retention=60)
+    store.load()
+    now = time.time()
+    store._write({"order_id": "old_charged", "status": "CHARGED"}, now - 120)
+    store._write({"order_id": "old_pending", "status": "PENDING_VBV"}, now - 120)
+    store._write({"order_id": "new_charged", "status": "CHARGED"}, now - 1)
+    store.close()
+
+    reloaded = OrderStatusStore(max_entries=10, db_path=db_path, retention=60)
+    reloaded.load()
+    reloaded.close()
+
+    assert reloaded.get("old_charged") is None
+    assert reloaded.get("old_pending") is not None
+    assert reloaded.get("new_charged") is not None
+
+
+def test_load_keeps_only_the_newest_max_entries(tmp_path):
+    db_path = str(tmp_path / "orders.db")
+    store = OrderStatusStore(max_entries=2, db_path=db_path)
+    store.load()
+    now = time.time()
+    for offset, order_id in enumerate(["o1", "o2", "o3"]):
+        store._write({"order_id": order_id, "status": "PENDING_VBV"}, now + offset)
+    store.close()
+
+    reloaded = OrderStatusStore(max_entries=2, db_path=db_path)
+    reloaded.load()
+    count = reloaded._db.execute("SELECT COUNT(*) FROM order_status").fetchone()[0]
+    reloaded.close()
+
+    assert count == 2
+    assert reloaded.get("o1") is None
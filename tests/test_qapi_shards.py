@@ -0,0 +1,89 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import asyncio
+
+from juspay_dashboard_mcp.api import qapi
+from juspay_dashboard_mcp.api.qapi import merge_shard_rows
+from juspay_dashboard_mcp.api_schema.qapi import QApiPayload
+
+THREE_DAYS = {"start": "2025-01-01T00:00:00Z", "end": "2025-01-03T23:59:59Z"}
+
+
+def _run_sharded(monkeypatch, payload, shard_rows):
+    calls = []
+
+    async def fake_call_query_api(payload, meta_info=None, max_rows=None):
+        calls.append(payload)
+        return [dict(row) for row in shard_rows[len(calls) - 1]]
+
+    monkeypatch.setattr(qapi, "call_query_api", fake_call_query_api)
+    merged = asyncio.run(qapi.call_sharded_query_api(QApiPayload.model_validate(payload), "day", max_rows=payload.get("max_rows")))
+    return merged, calls
+
+
+def test_merge_sums_additive_and_recomputes_ratios():
+    shards = [
+        [{"payment_gateway": "PG1", "order_with_transactions": 10, "success_rate": 50.0}],
+        [{"payment_gateway": "PG1", "order_with_transactions": 30, "success_rate": 90.0}],
+    ]
+
+    merged = merge_shard_rows(shards, ["order_with_transactions", "success_rate"])
+
+    assert merged == [{"payment_gateway": "PG1", "order_with_transactions": 40, "success_rate": 80.0}]
+
+
+def test_merge_ignores_shards_without_a_denominator():
+    shards = [
+        [{"payment_gateway": "PG1", "order_with_transactions": 0, "success_rate": 0.0}],
+        [{"payment_gateway": "PG1", "success_rate": 70.0}],
+        [{"payment_gateway": "PG1", "order_with_transactions": 20, "success_rate": 40.0}],
+        [{"payment_gateway": "PG2", "order_with_transactions": 0, "success_rate": 0.0}],
+    ]
+
+    merged = merge_shard_rows(shards, ["order_with_transactions", "success_rate"])
+
+    assert merged == [
+        {"payment_gateway": "PG1", "order_with_transactions": 20, "success_rate": 40.0},
+        {"payment_gateway": "PG2", "order_with_transactions": 0, "success_rate": None},
+    ]
+
+
+def test_sharded_query_sorts_and_caps_the_merged_rows(monkeypatch):
+    payload = {
+        "metric": "order_with_transactions",
+        "interval": THREE_DAYS,
+        "dimensions": ["payment_gateway"],
+        "sortedOn": {"sortDimension": "order_with_transactions", "ordering": "Desc"},
+        "max_rows": 1,
+    }
+    shard_rows = [
+        [{"payment_gateway": "PG1", "order_with_transactions": 5}, {"payment_gateway": "PG2", "order_with_transactions": 4}],
+        [{"payment_gateway": "PG2", "order_with_transactions": 4}],
+        [{"payment_gateway": "PG1", "order_with_transactions": 1}, {"payment_gateway": "PG2", "order_with_transactions": 1}],
+    ]
+
+    merged, calls = _run_sharded(monkeypatch, payload, shard_rows)
+
+    assert len(calls) == 3
+    assert merged == [{"payment_gateway": "PG2", "order_with_transactions": 9}]
+
+
+def test_top_n_limit_and_average_latency_are_not_sharded(monkeypatch):
+    limit_filter = {
+        "condition": "In",
+        "field": "payment_gateway",
+        "val": {"limit": 1, "sortedOn": {"sortDimension": "order_with_transactions", "ordering": "Desc"}},
+    }
+    for payload in (
+        {"metric": "order_with_transactions", "interval": THREE_DAYS, "filters": limit_filter},
+        {"metric": ["success_volume", "average_latency"], "interval": THREE_DAYS},
+    ):
+        _, calls = _run_sharded(monkeypatch, payload, [[{"order_with_transactions": 1}]])
+
+        assert len(calls) == 1
+        assert calls[0].interval.start == THREE_DAYS["start"]
+        assert calls[0].interval.end == THREE_DAYS["end"]
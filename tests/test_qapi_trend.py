@@ -0,0 +1,34 @@
+# Copyright 2025 Juspay
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at https://www.apache.org/licenses/LICENSE-2.0.txt
+
+import asyncio
+
+from juspay_dashboard_mcp.api import qapi
+from juspay_dashboard_mcp.api_schema.qapi import QApiPayload
+
+HOURLY = {"granularity": {"unit": "hour", "duration": 1}, "intervalCol": "order_created_at", "timeZone": "Asia/Kolkata"}
+
+
+def test_unmappable_labels_do_not_double_upstream_calls(monkeypatch):
+    calls = []
+
+    async def fake_call_query_api(payload, meta_info=None, max_rows=None):
+        calls.append(payload.interval)
+        return [{"order_created_at_time": "1 Jan, 10 AM", "order_with_transactions": 3}]
+
+    monkeypatch.setattr(qapi, "call_query_api", fake_call_query_api)
+    payload = QApiPayload.model_validate({
+        "metric": "order_with_transactions",
+        "interval": {"start": "2025-01-01T00:00:00Z", "end": "2025-01-01T23:59:59Z"},
+        "dimensions": [HOURLY],
+    })
+    dimension = qapi.trend_dimension(payload)
+
+    first = asyncio.run(qapi.call_trend_query_api(payload, dimension))
+    second = asyncio.run(qapi.call_trend_query_api(payload, dimension))
+
+    assert first == second == [{"order_created_at_time": "1 Jan, 10 AM", "order_with_transactions": 3}]
+    assert calls == [payload.interval, payload.interval]